@@ -55,8 +55,13 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "mainapp.middleware.BackendTimingMiddleware",
+    "mainapp.middleware.BackendUnavailableMiddleware",
 ]
 
+# Backend call metrics are served only to the requests coming from these addresses
+INTERNAL_IPS = ["127.0.0.1", "::1"]
+
 ROOT_URLCONF = "algodjango.urls"
 
 TEMPLATES = [
@@ -81,13 +86,151 @@ WSGI_APPLICATION = "algodjango.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
-DATABASES = {
+# The backend is selected by the DATABASE_ENGINE environment variable, either
+# "sqlite3" (the default) or "postgresql". Connections are kept open between
+# requests for DATABASE_CONN_MAX_AGE seconds. SQLite connections are switched
+# to WAL journal mode in `mainapp.signals` and wait up to SQLITE_BUSY_TIMEOUT
+# seconds for a lock held by a concurrent writer.
+
+DATABASE_ENGINE = os.environ.get("DATABASE_ENGINE", "sqlite3")
+
+if DATABASE_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DATABASE_NAME", "algodjango"),
+            "USER": os.environ.get("DATABASE_USER", ""),
+            "PASSWORD": os.environ.get("DATABASE_PASSWORD", ""),
+            "HOST": os.environ.get("DATABASE_HOST", ""),
+            "PORT": os.environ.get("DATABASE_PORT", ""),
+            "CONN_MAX_AGE": int(os.environ.get("DATABASE_CONN_MAX_AGE", 600)),
+        }
+    }
+
+elif DATABASE_ENGINE == "sqlite3":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DATABASE_NAME") or BASE_DIR / "db.sqlite3",
+            "CONN_MAX_AGE": int(os.environ.get("DATABASE_CONN_MAX_AGE", 600)),
+            "OPTIONS": {
+                "timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 20)),
+            },
+        }
+    }
+
+else:
+    raise ImproperlyConfigured(
+        "Unsupported DATABASE_ENGINE environment variable: %s" % DATABASE_ENGINE
+    )
+
+
+# Algorand nodes
+# Addresses and API tokens of the algod, indexer and kmd daemons; the defaults
+# correspond to the Algorand Sandbox started on the local computer. Algod and
+# indexer addresses are comma-separated lists, where the first algod address is
+# the primary node transactions are submitted to. Reads are spread among the
+# nodes lagging no more than NODE_MAX_LAG rounds behind the most advanced one,
+# checked every HEALTH_CHECK_INTERVAL seconds.
+
+SANDBOX_TOKEN = "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+
+ALGOD_ADDRESSES = os.environ.get("ALGOD_ADDRESSES", "http://localhost:4001").split(",")
+ALGOD_TOKEN = os.environ.get("ALGOD_TOKEN", SANDBOX_TOKEN)
+
+INDEXER_ADDRESSES = os.environ.get("INDEXER_ADDRESSES", "http://localhost:8980").split(
+    ","
+)
+INDEXER_TOKEN = os.environ.get("INDEXER_TOKEN", SANDBOX_TOKEN)
+
+KMD_ADDRESS = os.environ.get("KMD_ADDRESS", "http://localhost:4002")
+KMD_TOKEN = os.environ.get("KMD_TOKEN", SANDBOX_TOKEN)
+
+NODE_MAX_LAG = int(os.environ.get("NODE_MAX_LAG", 2))
+HEALTH_CHECK_INTERVAL = int(os.environ.get("HEALTH_CHECK_INTERVAL", 10))
+
+# Format of the algod responses from the endpoints supporting it (blocks and
+# pending transactions), either "json" or the more compact "msgpack"
+ALGOD_RESPONSE_FORMAT = os.environ.get("ALGOD_RESPONSE_FORMAT", "json")
+
+
+# Backend calls
+# Timeouts in seconds per backend, optionally overridden per endpoint by
+# "backend.endpoint" keys. Failed idempotent reads are retried up to
+# BACKEND_RETRIES times, with random backoff of up to BACKEND_RETRY_BACKOFF
+# seconds doubled on every retry. Reads slower than backend's hedge delay in
+# seconds get a duplicate call. A backend failing CIRCUIT_BREAKER_THRESHOLD
+# times in a row isn't called for CIRCUIT_BREAKER_COOLDOWN seconds. Calls are
+# made by a pool of BACKEND_POOL_SIZE threads per backend, except long-polling
+# calls made by the calling thread.
+
+BACKEND_TIMEOUTS = {
+    "algod": 10,
+    "algod.status_after_block": 70,
+    "indexer": 15,
+    "kmd": 10,
+}
+BACKEND_HEDGE_DELAYS = {}
+if os.environ.get("INDEXER_HEDGE_DELAY"):
+    BACKEND_HEDGE_DELAYS["indexer"] = float(os.environ["INDEXER_HEDGE_DELAY"])
+BACKEND_RETRIES = int(os.environ.get("BACKEND_RETRIES", 2))
+BACKEND_RETRY_BACKOFF = float(os.environ.get("BACKEND_RETRY_BACKOFF", 0.1))
+BACKEND_POOL_SIZE = int(os.environ.get("BACKEND_POOL_SIZE", 32))
+CIRCUIT_BREAKER_THRESHOLD = int(os.environ.get("CIRCUIT_BREAKER_THRESHOLD", 5))
+CIRCUIT_BREAKER_COOLDOWN = int(os.environ.get("CIRCUIT_BREAKER_COOLDOWN", 30))
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
     }
 }
 
+# Number of seconds the rendered accounts, wallets and assets lists are cached for
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get("FRAGMENT_CACHE_TIMEOUT", 300))
+
+
+# Number of rows displayed on a page of the accounts, wallets and assets lists
+LIST_PAGE_SIZE = int(os.environ.get("LIST_PAGE_SIZE", 50))
+
+
+# Largest page of transactions and the largest number of addresses served by a
+# single JSON API request, and the number of concurrent balance lookups
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", 1000))
+API_MAX_ADDRESSES = int(os.environ.get("API_MAX_ADDRESSES", 100))
+BALANCES_CONCURRENCY = int(os.environ.get("BALANCES_CONCURRENCY", 8))
+
+
+# Number of accounts whose stored balances are refreshed by a single update
+# query, and the number of seconds between the refreshes of the
+# `refresh_balances --loop` command
+BALANCE_REFRESH_BATCH_SIZE = int(os.environ.get("BALANCE_REFRESH_BATCH_SIZE", 500))
+BALANCE_REFRESH_INTERVAL = int(os.environ.get("BALANCE_REFRESH_INTERVAL", 10))
+
+
+# Number of the largest holders displayed for Algos and every asset in portfolio
+PORTFOLIO_TOP_HOLDERS = int(os.environ.get("PORTFOLIO_TOP_HOLDERS", 10))
+
+
+# Number of worker processes signing transactions in batches, and the smallest
+# batch worth sending to them instead of signing in the calling thread
+SIGNING_WORKERS = int(os.environ.get("SIGNING_WORKERS", os.cpu_count() or 1))
+SIGNING_POOL_MIN_BATCH = int(os.environ.get("SIGNING_POOL_MIN_BATCH", 64))
+
+
+# Number of seconds an account's events stream is kept open, and the number of
+# milliseconds the browser waits before reconnecting after the stream ends. Every
+# open account page holds a server thread for the whole stream, so serve the
+# project by threaded WSGI workers or by ASGI in production
+ACCOUNT_EVENTS_TIMEOUT = int(os.environ.get("ACCOUNT_EVENTS_TIMEOUT", 300))
+ACCOUNT_EVENTS_RETRY = int(os.environ.get("ACCOUNT_EVENTS_RETRY", 3000))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -1,3 +1,202 @@
-from django.contrib import admin
+import csv
 
-# Register your models here.
+from algosdk.constants import tx_group_limit
+from django.conf import settings
+from django.contrib import admin, messages
+from django.http import StreamingHttpResponse
+
+from . import helpers
+from .constants import INITIAL_FUNDS
+from .models import Account, Asset, Wallet, WalletAccount
+from .refresh import refresh_accounts
+
+
+class _Echo:
+    """File-like object returning the written value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _with_header(header, rows):
+    """Yield provided header followed by provided rows."""
+    yield header
+    yield from rows
+
+
+@admin.action(description="Export selected to CSV")
+def export_selected(modeladmin, request, queryset):
+    """Stream export fields of selected rows as a CSV file."""
+    writer = csv.writer(_Echo())
+    rows = (
+        queryset.order_by("pk")
+        .values_list(*modeladmin.export_fields)
+        .iterator(chunk_size=settings.LIST_PAGE_SIZE)
+    )
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in _with_header(modeladmin.export_fields, rows)),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = 'attachment; filename="%s.csv"' % (
+        queryset.model._meta.model_name,
+    )
+    return response
+
+
+@admin.action(description="Fund selected accounts with initial funds")
+def fund_selected(modeladmin, request, queryset):
+    """Transfer initial funds to selected accounts in a single batch."""
+    sender = helpers.initial_funds_sender()
+    if sender is None:
+        modeladmin.message_user(
+            request, "There's no account to fund the accounts from!", messages.ERROR
+        )
+        return
+    passphrase = helpers.cli_passphrase_for_account(sender)
+    addresses = list(queryset.values_list("address", flat=True))
+    error_field, error_description = helpers.add_transactions(
+        [
+            (sender, address, passphrase, INITIAL_FUNDS, "Initial funds")
+            for address in addresses
+        ]
+    )
+    if error_field is None:
+        modeladmin.message_user(
+            request,
+            "Funding failed: %s. The accounts are funded in atomic groups of "
+            "up to %d, so an account may have failed only along with another "
+            "account of its group." % (error_description, tx_group_limit),
+            messages.ERROR,
+        )
+        return
+    if error_field != "":
+        modeladmin.message_user(
+            request, "Funding failed: %s" % (error_description,), messages.ERROR
+        )
+        return
+    modeladmin.message_user(
+        request, "%d accounts have been funded." % (len(addresses),), messages.SUCCESS
+    )
+
+
+@admin.action(description="Refresh balances of selected accounts")
+def refresh_balances(modeladmin, request, queryset):
+    """Refresh stored balances and activity of selected accounts."""
+    refreshed, changed = refresh_accounts(
+        queryset=Account.objects.filter(pk__in=queryset.values("pk"))
+    )
+    modeladmin.message_user(
+        request,
+        "%d accounts have been refreshed, %d of them changed." % (refreshed, changed),
+        messages.SUCCESS,
+    )
+
+
+class _NetworkModelAdmin(admin.ModelAdmin):
+    """Admin of the models whose instances are created on the network first.
+
+    Instances are created only by the application's views, and changelists
+    display stored values only, so listing them makes no backend calls.
+    """
+
+    list_per_page = settings.LIST_PAGE_SIZE
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        """Disallow adding instances that don't exist on the network."""
+        return False
+
+
+class AccountAdmin(_NetworkModelAdmin):
+    """Accounts admin displaying the stored balances."""
+
+    actions = [fund_selected, refresh_balances, export_selected]
+    exclude = ("private_key",)
+    export_fields = (
+        "address",
+        "balance",
+        "last_round",
+        "last_activity",
+        "refreshed",
+        "created",
+    )
+    list_display = (
+        "address",
+        "wallet",
+        "balance",
+        "last_round",
+        "last_activity",
+        "refreshed",
+        "created",
+    )
+    list_select_related = ("walletaccount__wallet",)
+    readonly_fields = ("balance", "last_round", "last_activity", "refreshed")
+    search_fields = ("address__exact",)
+
+    @admin.display(description="Wallet")
+    def wallet(self, obj):
+        """Return the wallet of provided account if it belongs to a wallet."""
+        try:
+            return obj.walletaccount.wallet
+        except WalletAccount.DoesNotExist:
+            return None
+
+
+class AssetAdmin(_NetworkModelAdmin):
+    """Assets admin searchable by asset ID and creator."""
+
+    actions = [export_selected]
+    export_fields = (
+        "asset_id",
+        "name",
+        "unit",
+        "total",
+        "decimals",
+        "creator",
+        "created",
+    )
+    list_display = (
+        "asset_id",
+        "name",
+        "unit",
+        "total",
+        "decimals",
+        "creator",
+        "created",
+    )
+    search_fields = ("creator__exact",)
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search assets by creator's address or by asset ID."""
+        if search_term.strip().isdigit():
+            return queryset.filter(asset_id=int(search_term)), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+class WalletAccountAdmin(AccountAdmin):
+    """Wallet accounts admin displaying the stored balances."""
+
+    export_fields = ("wallet__wallet_id", *AccountAdmin.export_fields)
+    list_select_related = ("wallet",)
+    search_fields = ("address__exact", "wallet__wallet_id__exact")
+
+    @admin.display(description="Wallet", ordering="wallet__name")
+    def wallet(self, obj):
+        """Return the wallet of provided account."""
+        return obj.wallet
+
+
+class WalletAdmin(_NetworkModelAdmin):
+    """Wallets admin searchable by name and ID."""
+
+    actions = [export_selected]
+    exclude = ("password",)
+    export_fields = ("wallet_id", "name", "created")
+    list_display = ("name", "wallet_id", "created")
+    search_fields = ("name__exact", "wallet_id__exact")
+
+
+admin.site.register(Account, AccountAdmin)
+admin.site.register(Asset, AssetAdmin)
+admin.site.register(Wallet, WalletAdmin)
+admin.site.register(WalletAccount, WalletAccountAdmin)
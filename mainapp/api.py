@@ -0,0 +1,165 @@
+"""Read-only JSON endpoints of accounts and assets.
+
+Every response carries ETag and Last-Modified headers derived from the latest
+round of the backend it's served from, since neither balances nor
+transactions can change before a new round is confirmed and indexed. Clients
+repeating a request with If-None-Match or If-Modified-Since get an empty 304
+response for the cost of a single status call, without the account and
+transactions lookups. Rounds, and the balances and blocks of those rounds,
+are read from the primary nodes, so they don't go back and forth between the
+nodes lagging behind each other.
+"""
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.http import condition, require_GET
+
+from . import helpers
+from .models import Account, Asset, WalletAccount
+from .pagination import keyset_page
+
+
+def _confirmed_round():
+    """Return the latest round confirmed by the primary algod node."""
+    return helpers.current_round(primary=True)
+
+
+def _indexed_round():
+    """Return the latest round processed by the primary indexer node."""
+    return helpers.indexed_round()
+
+
+def _latest_round(request, source=_confirmed_round):
+    """Return the latest round from provided source, retrieved once per request."""
+    if not hasattr(request, "latest_round"):
+        request.latest_round = source()
+    return request.latest_round
+
+
+def round_condition(source):
+    """Return conditional view decorator for the rounds from provided source."""
+
+    def etag(request, *args, **kwargs):
+        return "round-%s" % (_latest_round(request, source),)
+
+    def last_modified(request, *args, **kwargs):
+        return helpers.round_timestamp(_latest_round(request, source), primary=True)
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
+
+
+confirmed_round_condition = round_condition(_confirmed_round)
+indexed_round_condition = round_condition(_indexed_round)
+
+
+def _error(message, status=400):
+    """Return JSON response with provided error message."""
+    return JsonResponse({"error": message}, status=status)
+
+
+@require_GET
+@confirmed_round_condition
+def account(request, address):
+    """Return details of the account with provided address."""
+    instance = Account.instance_from_address(address)
+    wallet_id = (
+        WalletAccount.objects.filter(pk=instance.pk)
+        .values_list("wallet__wallet_id", flat=True)
+        .first()
+    )
+    return JsonResponse(
+        {
+            "address": instance.address,
+            "balance": helpers.account_balance(instance.address, primary=True),
+            "created": instance.created,
+            "wallet": wallet_id,
+            "round": _latest_round(request),
+        }
+    )
+
+
+@require_GET
+@indexed_round_condition
+def account_transactions(request, address):
+    """Return page of transactions of the account with provided address.
+
+    Page size is set by the `limit` query parameter and the following page
+    is requested by passing returned `next` token in the `next` parameter.
+    """
+    from algosdk.error import IndexerHTTPError
+
+    instance = Account.instance_from_address(address)
+    limit = request.GET.get("limit", "")
+    if limit and not limit.isdigit():
+        return _error("Limit must be a positive integer!")
+    limit = min(int(limit or settings.LIST_PAGE_SIZE), settings.API_MAX_PAGE_SIZE)
+    try:
+        transactions, next_page = helpers.account_transactions_page(
+            instance.address, limit or 1, request.GET.get("next") or None, primary=True
+        )
+    except IndexerHTTPError as err:
+        if not 400 <= (getattr(err, "code", None) or 0) < 500:
+            raise
+        return _error("Invalid next token!")
+    return JsonResponse(
+        {
+            "transactions": transactions,
+            "next": next_page,
+            "round": _latest_round(request, _indexed_round),
+        }
+    )
+
+
+@require_GET
+@confirmed_round_condition
+def assets(request):
+    """Return page of the created assets.
+
+    Adjacent pages are requested by passing returned cursors in the `after`
+    and `before` query parameters.
+    """
+    page = keyset_page(Asset.objects.all(), ("-created", "-id"), request.GET)
+    return JsonResponse(
+        {
+            "assets": [
+                {
+                    "asset_id": asset.asset_id,
+                    "creator": asset.creator,
+                    "name": asset.name,
+                    "unit": asset.unit,
+                    "total": asset.total,
+                    "decimals": asset.decimals,
+                    "frozen": asset.frozen,
+                    "url": asset.url,
+                    "created": asset.created,
+                }
+                for asset in page
+            ],
+            "next": page.next_cursor or None,
+            "previous": page.previous_cursor or None,
+            "round": _latest_round(request),
+        }
+    )
+
+
+@require_GET
+@confirmed_round_condition
+def balances(request):
+    """Return balances of the accounts from the `address` query parameters."""
+    from algosdk.encoding import is_valid_address
+
+    addresses = list(dict.fromkeys(request.GET.getlist("address")))
+    if not addresses:
+        return _error("At least one address is required!")
+    if len(addresses) > settings.API_MAX_ADDRESSES:
+        return _error(
+            "At most %s addresses are allowed!" % (settings.API_MAX_ADDRESSES,)
+        )
+    invalid = [address for address in addresses if not is_valid_address(address)]
+    if invalid:
+        return _error("Invalid address: %s" % (", ".join(invalid),))
+    return JsonResponse(
+        {
+            "balances": helpers.account_balances(addresses, primary=True),
+            "round": _latest_round(request),
+        }
+    )
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MainappConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "mainapp"
+
+    def ready(self):
+        """Connect the application's signal handlers."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,13 @@
+"""Constants used at import time by the models and forms.
+
+Importing any module of the Algorand SDK imports the whole SDK, so the values
+of its constants needed by the models and forms are repeated here.
+"""
+INITIAL_FUNDS = 1000000000  # in microAlgos
+
+address_len = 58
+hash_len = 32
+max_asset_decimals = 19
+metadata_length = 32
+mnemonic_len = 25
+note_max_length = 1024
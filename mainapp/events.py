@@ -0,0 +1,142 @@
+"""Server-sent events streams of the accounts' activity."""
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from . import helpers
+from .resilience import BackendUnavailable
+
+
+class RoundWatcher:
+    """Watcher of the new rounds shared by all the streams of the process.
+
+    While any stream is subscribed, a single background thread awaits every
+    new round by a long-polling algod call and wakes up all the waiting
+    streams once it's confirmed, so the number of open streams doesn't affect
+    the number of algod calls nor the threads held by them.
+    """
+
+    def __init__(self):
+        self.round = None
+        self.error = None
+        self.subscribers = 0
+        self._running = False
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def subscription(self):
+        """Context manager keeping the watcher running for the enclosed stream."""
+        with self._condition:
+            self.subscribers += 1
+            if not self._running:
+                self._running = True
+                threading.Thread(
+                    target=self._watch, name="round-watcher", daemon=True
+                ).start()
+        try:
+            yield self
+        finally:
+            with self._condition:
+                self.subscribers -= 1
+
+    def wait(self, round_number, timeout):
+        """Return the latest round once a round following provided one is confirmed.
+
+        Return the last known round if no new round is confirmed before the
+        timeout, and raise `BackendUnavailable` if the watcher can't reach algod.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.error is not None or (self.round or 0) > round_number,
+                timeout,
+            )
+            if self.error is not None:
+                raise self.error
+            return max(self.round or 0, round_number)
+
+    def _watch(self):
+        """Await new rounds until there are no subscribed streams.
+
+        Any error of the algod call is passed to the waiting streams as
+        `BackendUnavailable`, so they end and the browsers reconnect later,
+        while the watcher keeps retrying for the remaining subscribers.
+        """
+        try:
+            while True:
+                with self._condition:
+                    if not self.subscribers:
+                        return
+                    last_round = self.round
+                try:
+                    if last_round is None:
+                        latest_round = helpers.current_round()
+                    else:
+                        latest_round = helpers.wait_for_round(last_round)
+                except Exception as err:
+                    if not isinstance(err, BackendUnavailable):
+                        err = BackendUnavailable("algod", err)
+                    with self._condition:
+                        self.error = err
+                        self._condition.notify_all()
+                    time.sleep(settings.ACCOUNT_EVENTS_RETRY / 1000)
+                    continue
+                with self._condition:
+                    self.round = latest_round
+                    self.error = None
+                    self._condition.notify_all()
+        finally:
+            with self._condition:
+                self._running = False
+
+
+round_watcher = RoundWatcher()
+
+
+def _event(name, data, event_id):
+    """Return server-sent event message of provided name, data and ID."""
+    return "id: %s\nevent: %s\ndata: %s\n\n" % (event_id, name, json.dumps(data))
+
+
+def account_events(address, last_round=None):
+    """Yield server-sent events on provided account's new transactions and balance.
+
+    Every new round is awaited from the process' round watcher and only then
+    the indexer is asked for the account's transactions confirmed after the
+    last delivered one. Once the indexer returns a transaction, all the rounds
+    up to its round are indexed, so that round is safely used as the event ID
+    from which the browser resumes after the stream ends and it reconnects.
+    """
+    deadline = time.monotonic() + settings.ACCOUNT_EVENTS_TIMEOUT
+    yield "retry: %d\n\n" % (settings.ACCOUNT_EVENTS_RETRY,)
+
+    try:
+        with round_watcher.subscription():
+            latest_round = helpers.current_round()
+            last_round = last_round or latest_round
+            while time.monotonic() < deadline:
+                new_round = round_watcher.wait(
+                    latest_round, deadline - time.monotonic()
+                )
+                if new_round <= latest_round:
+                    continue
+                latest_round = new_round
+                transactions = helpers.account_transactions(
+                    address, min_round=last_round + 1
+                )
+                if not transactions:
+                    yield ": round %s\n\n" % (latest_round,)
+                    continue
+
+                last_round = max(tr["round"] for tr in transactions)
+                balance = helpers.account_balance(address)
+                for transaction in sorted(transactions, key=lambda tr: tr["round"]):
+                    yield _event("transaction", transaction, last_round)
+                yield _event(
+                    "balance", {"balance": balance, "round": latest_round}, last_round
+                )
+
+    except BackendUnavailable:
+        return  # the browser reconnects after the retry period
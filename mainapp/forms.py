@@ -1,12 +1,18 @@
-from algosdk.constants import address_len, mnemonic_len, note_max_length
-from algosdk.encoding import is_valid_address
 from django import forms
 from django.core.exceptions import ValidationError
 from django.forms.fields import CharField
 
+from .constants import address_len, mnemonic_len, note_max_length
 from .models import Asset
 
 
+def _is_valid_address(address):
+    """Return True if provided value is a valid Algorand address."""
+    from algosdk.encoding import is_valid_address
+
+    return is_valid_address(address)
+
+
 class TransferFundsForm(forms.Form):
     """Django form for transferring microAlgos between accounts."""
 
@@ -28,7 +34,7 @@ class TransferFundsForm(forms.Form):
     def clean_receiver(self):
         """Example validation for the receiver field."""
         data = self.cleaned_data["receiver"]
-        if not is_valid_address(data):
+        if not _is_valid_address(data):
             raise ValidationError("Provided value is not a valid Algorand address!")
         return data
 
@@ -58,7 +64,7 @@ class CreateAssetForm(forms.models.ModelForm):
     def _clean_address(self, field):
         """Base method for validation of fields holding Algorand address."""
         data = self.cleaned_data[field]
-        if data != "" and not is_valid_address(data):
+        if data != "" and not _is_valid_address(data):
             raise ValidationError("Provided value is not a valid Algorand address!")
         return data
 
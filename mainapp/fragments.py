@@ -0,0 +1,37 @@
+"""Keys of the cached template fragments rendering the lists of model instances.
+
+Every list's cache key consists of the list's version and IDs of the list
+rows. The version is increased by the signal handlers whenever a row is
+created and, for the lists displaying balances, after the stored balances are
+refreshed, so any change of the rows or balances renders the list anew.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+
+def _version_key(name):
+    """Return cache key of provided list's version."""
+    return "fragments:version:%s" % (name,)
+
+
+def list_version(name):
+    """Return the current version of provided list."""
+    return cache.get_or_set(_version_key(name), 1, None)
+
+
+def invalidate(name):
+    """Increase the version of provided list and so invalidate its fragments."""
+    try:
+        cache.incr(_version_key(name))
+    except ValueError:
+        cache.set(_version_key(name), 1, None)
+
+
+def fragment_context(name, rows):
+    """Return template context needed for caching provided list's fragment."""
+    version = list_version(name)
+    ids = ",".join(str(row.pk) for row in rows)
+    return {
+        "fragment_key": "%s:%s" % (version, ids),
+        "fragment_timeout": settings.FRAGMENT_CACHE_TIMEOUT,
+    }
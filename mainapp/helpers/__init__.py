@@ -0,0 +1,54 @@
+"""Helpers calling Algorand nodes and sandbox, imported on their first use.
+
+Every helper lives in one of this package's modules and the module, together
+with the Algorand SDK, is imported only when the helper is accessed as this
+package's attribute. Management commands, migrations and workers that make
+no blockchain calls so don't pay for importing the SDK.
+"""
+import importlib
+
+from ..constants import INITIAL_FUNDS
+
+_MODULES = {
+    "cli_passphrase_for_account": "sandbox",
+    "add_transaction": "transactions",
+    "add_transactions": "transactions",
+    "add_asset": "creating",
+    "add_standalone_account": "creating",
+    "add_wallet": "creating",
+    "account_balance": "retrieving",
+    "account_balances": "retrieving",
+    "account_last_activities": "retrieving",
+    "account_last_activity": "retrieving",
+    "account_states": "retrieving",
+    "account_transactions": "retrieving",
+    "account_transactions_page": "retrieving",
+    "asset_holdings": "retrieving",
+    "assets_holdings": "retrieving",
+    "current_round": "retrieving",
+    "get_wallet": "retrieving",
+    "indexed_round": "retrieving",
+    "initial_funds_sender": "retrieving",
+    "passphrase_from_private_key": "retrieving",
+    "round_timestamp": "retrieving",
+    "search_transactions": "retrieving",
+    "wait_for_round": "retrieving",
+}
+
+
+def __getattr__(name):
+    """Return provided helper, importing its module on the first access.
+
+    The helper is then stored in this package's globals, so the following
+    accesses don't reach this function.
+    """
+    if name not in _MODULES:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    helper = getattr(importlib.import_module("." + _MODULES[name], __name__), name)
+    globals()[name] = helper
+    return helper
+
+
+def __dir__():
+    """Return names of this package's attributes including the helpers."""
+    return sorted([*globals(), *_MODULES])
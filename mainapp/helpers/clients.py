@@ -0,0 +1,86 @@
+"""Clients of the algod, indexer and kmd nodes.
+
+The clients are proxies instantiated per call and the SDK client of a node is
+constructed only when the node is called for the first time.
+"""
+import functools
+
+from django.conf import settings
+
+from .. import metrics, nodes, resilience, wire
+
+
+class InstrumentedClient:
+    """Proxy to SDK clients of a nodes pool calling through the resilience layer.
+
+    Every method call is routed to the pool's primary node or to the node
+    picked for reading, and it's recorded in metrics. Hedging calls of the
+    reads go to another caught-up node if the pool has one.
+    """
+
+    def __init__(self, pool, primary=False):
+        self._pool = pool
+        self._primary = primary
+
+    def __getattr__(self, name):
+        attribute = getattr(self._pool.nodes[0].client, name)
+        if not callable(attribute):
+            return attribute
+
+        def node_call(node, *args, **kwargs):
+            with node.call():
+                return getattr(node.client, name)(*args, **kwargs)
+
+        @functools.wraps(attribute)
+        def resilient_call(*args, **kwargs):
+            if self._primary:
+                node = hedge_node = self._pool.primary()
+            else:
+                node = self._pool.reader()
+                hedge_node = self._pool.reader(exclude=node)
+            with metrics.timed(self._pool.backend, name):
+                return resilience.call(
+                    self._pool.backend,
+                    name,
+                    functools.partial(node_call, node),
+                    *args,
+                    circuit=node.address,
+                    hedge=functools.partial(node_call, hedge_node),
+                    **kwargs,
+                )
+
+        return resilient_call
+
+
+def algod_client(primary=False):
+    """Return Algod client object.
+
+    Transactions must be submitted and followed by the `primary` client.
+    """
+    return InstrumentedClient(nodes.pool("algod"), primary=primary)
+
+
+def algod_response(function, *args):
+    """Return decoded response of provided algod client's method.
+
+    The method is called in the format from ALGOD_RESPONSE_FORMAT setting, so
+    it must be one of the methods supporting `response_format` argument.
+    """
+    response_format = settings.ALGOD_RESPONSE_FORMAT
+    response = function(*args, response_format=response_format)
+    if response_format == "msgpack":
+        return wire.decode(response, response_format)
+    return response
+
+
+def indexer_client(primary=False):
+    """Return Indexer client object.
+
+    Rounds that mustn't go back between calls are read by the `primary` client.
+    """
+    return InstrumentedClient(nodes.pool("indexer"), primary=primary)
+
+
+def kmd_client():
+    """Return kmd client object."""
+    return InstrumentedClient(nodes.pool("kmd"), primary=True)
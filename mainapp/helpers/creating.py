@@ -0,0 +1,63 @@
+"""Creation of the accounts, wallets and assets."""
+from algosdk import account, mnemonic
+from algosdk.error import WrongMnemonicLengthError
+from algosdk.future.transaction import AssetConfigTxn
+from algosdk.wallet import Wallet
+
+from .clients import algod_client, algod_response, kmd_client
+from .transactions import wait_for_confirmation
+
+
+def add_asset(data):
+    """Create asset from provided data dictionary."""
+    client = algod_client(primary=True)
+    params = client.suggested_params()
+    unsigned_txn = AssetConfigTxn(
+        sp=params,
+        sender=data.get("creator"),
+        asset_name=data.get("name"),
+        unit_name=data.get("unit"),
+        total=data.get("total"),
+        decimals=data.get("decimals"),
+        default_frozen=data.get("frozen"),
+        url=data.get("url"),
+        manager=data.get("manager"),
+        reserve=data.get("reserve"),
+        freeze=data.get("freeze"),
+        clawback=data.get("clawback"),
+        strict_empty_address_check=False,
+    )
+    # Sign with secret key of creator
+    try:
+        signed_txn = unsigned_txn.sign(mnemonic.to_private_key(data.get("passphrase")))
+    except WrongMnemonicLengthError as err:
+        return None, err
+
+    try:
+        transaction_id = client.send_transaction(signed_txn)
+        wait_for_confirmation(client, transaction_id, 4)
+    except Exception as err:
+        return None, err
+
+    try:
+        info = algod_response(client.pending_transaction_info, transaction_id)
+        asset_id = info.get("asset-index")
+        return asset_id, ""
+
+    except Exception as err:
+        return None, err
+
+
+def add_standalone_account():
+    """Create standalone account and return two-tuple of its private key and address."""
+    private_key, address = account.generate_account()
+    return private_key, address
+
+
+def add_wallet(name, password):
+    """Create wallet and return its ID."""
+    try:
+        wallet = Wallet(name, password, kmd_client())
+    except:
+        return ""
+    return wallet.id
@@ -0,0 +1,231 @@
+"""Retrieving of the accounts, assets, blocks and transactions."""
+import base64
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from algosdk import mnemonic
+from algosdk.constants import microalgos_to_algos_ratio, min_txn_fee
+from algosdk.wallet import Wallet
+from django.conf import settings
+from django.core.cache import cache
+
+from .. import wire
+from ..constants import INITIAL_FUNDS
+from .clients import algod_client, algod_response, indexer_client, kmd_client
+
+
+def _account_state(address):
+    """Return funds balance of provided address and the round it's read in."""
+    account_info = algod_client().account_info(address)
+    return account_info.get("amount"), account_info.get("round")
+
+
+def _concurrently(function, keys):
+    """Return dictionary of provided function's results for every key.
+
+    The function is called concurrently for all the keys and the calls are
+    still counted in the current request's metrics.
+    """
+    if not keys:
+        return {}
+    with ThreadPoolExecutor(
+        max_workers=min(len(keys), settings.BALANCES_CONCURRENCY)
+    ) as executor:
+        results = [
+            executor.submit(contextvars.copy_context().run, function, key)
+            for key in keys
+        ]
+        return {key: result.result() for key, result in zip(keys, results)}
+
+
+def _transaction_row(transaction):
+    """Return compact row of provided indexer's transaction."""
+    return {
+        "id": transaction.get("id"),
+        "round": transaction.get("confirmed-round"),
+        "type": transaction.get("tx-type"),
+        "sender": transaction.get("sender"),
+        "receiver": transaction.get("payment-transaction", {}).get("receiver"),
+        "amount": transaction.get("payment-transaction", {}).get("amount"),
+        "note": base64.b64decode(transaction.get("note", "")).decode("utf-8"),
+    }
+
+
+def account_balance(address, primary=False):
+    """Return funds balance of the account having provided address.
+
+    The balance is read from the `primary` node to be consistent with its
+    `current_round`.
+    """
+    account_info = algod_client(primary=primary).account_info(address)
+    return account_info.get("amount")
+
+
+def account_balances(addresses, primary=False):
+    """Return dictionary of funds balances of the accounts having provided addresses."""
+    return _concurrently(functools.partial(account_balance, primary=primary), addresses)
+
+
+def account_last_activity(address):
+    """Return time of the latest transaction involving provided address."""
+    transactions = (
+        indexer_client()
+        .search_transactions_by_address(address, limit=1)
+        .get("transactions", [])
+    )
+    if not transactions:
+        return None
+    return datetime.fromtimestamp(transactions[0]["round-time"], tz=timezone.utc)
+
+
+def account_last_activities(addresses):
+    """Return dictionary of the latest transaction times of provided addresses."""
+    return _concurrently(account_last_activity, addresses)
+
+
+def account_states(addresses):
+    """Return dictionary of balance and round pairs of provided addresses.
+
+    Returned round is the round the balance has been read in.
+    """
+    return _concurrently(_account_state, addresses)
+
+
+def account_transactions(address, min_round=None):
+    """Return all transactions involving provided address.
+
+    If `min_round` is provided, only transactions confirmed in that round or
+    later are returned.
+    """
+    transactions = (
+        indexer_client()
+        .search_transactions_by_address(address, min_round=min_round)
+        .get("transactions", [])
+    )
+    return [_transaction_row(tr) for tr in transactions]
+
+
+def account_transactions_page(address, limit, next_page=None, primary=False):
+    """Return page of transactions involving provided address and next page token.
+
+    Returned next page token is None for the last page. The page is read from
+    the `primary` indexer node to be consistent with its `indexed_round`.
+    """
+    response = indexer_client(primary=primary).search_transactions_by_address(
+        address, limit=limit, next_page=next_page
+    )
+    return (
+        [_transaction_row(tr) for tr in response.get("transactions", [])],
+        response.get("next-token"),
+    )
+
+
+def asset_holdings(asset_id):
+    """Return dictionary of amounts of provided asset held by every holder.
+
+    Amounts are in the asset's base units, not adjusted for its decimals.
+    """
+    client = indexer_client()
+    holdings = {}
+    next_page = None
+    while True:
+        response = client.asset_balances(asset_id, limit=1000, next_page=next_page)
+        for balance in response.get("balances", []):
+            holdings[balance.get("address")] = balance.get("amount", 0)
+        next_page = response.get("next-token")
+        if not next_page or not response.get("balances"):
+            return holdings
+
+
+def assets_holdings(asset_ids):
+    """Return dictionary of holdings of every asset having provided ID."""
+    return _concurrently(asset_holdings, asset_ids)
+
+
+def block_transactions(round_number):
+    """Return compact rows of the transactions confirmed in provided round.
+
+    Used only by the `wireformat` benchmark, so it isn't exported as a helper.
+    """
+    block = algod_response(algod_client().block_info, round_number)
+    return wire.block_rows(block.get("block", {}), round_number)
+
+
+def current_round(primary=False):
+    """Return the latest confirmed round.
+
+    Rounds read from the `primary` node don't go back between the calls.
+    """
+    return algod_client(primary=primary).status().get("last-round")
+
+
+def get_wallet(name, password):
+    """Return wallet object from provided arguments."""
+    return Wallet(name, password, kmd_client())
+
+
+def indexed_round():
+    """Return the latest round processed by the primary indexer node."""
+    return indexer_client(primary=True).health().get("round")
+
+
+def initial_funds_sender():
+    """Get the address of initially created account having enough funds.
+
+    Such an account is used to transfer initial funds for the accounts
+    created in this tutorial.
+    """
+    return next(
+        (
+            account.get("address")
+            for account in indexer_client().accounts().get("accounts", [{}, {}])
+            if account.get("created-at-round") == 0
+            and account.get("status") == "Offline"
+            and account.get("amount")
+            > INITIAL_FUNDS + microalgos_to_algos_ratio / 10 + min_txn_fee
+        ),
+        None,
+    )
+
+
+def passphrase_from_private_key(private_key):
+    """Return passphrase from provided private key."""
+    return mnemonic.from_private_key(private_key)
+
+
+def round_timestamp(round_number, primary=False):
+    """Return datetime of the block confirmed in provided round.
+
+    Blocks never change, so their timestamps are cached indefinitely. A round
+    read from the `primary` node must be retrieved from it too, since the
+    other nodes may not have its block yet.
+    """
+    key = "round-timestamp:%s" % (round_number,)
+    timestamp = cache.get(key)
+    if timestamp is None:
+        block = algod_response(algod_client(primary=primary).block_info, round_number)
+        timestamp = block.get("block", {}).get("ts", 0)
+        cache.set(key, timestamp, None)
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def search_transactions(data):
+    """Search transaction based on criteria from provided data."""
+    criteria = {key: val for key, val in data.items() if val != ""}
+    transactions = (
+        indexer_client().search_transactions(**criteria).get("transactions", [])
+    )
+    # Decode notes to human-readable strings before returning the list
+    for tr in transactions:
+        tr["note"] = base64.b64decode(tr.get("note", "")).decode("utf-8")
+    return transactions
+
+
+def wait_for_round(round_number):
+    """Wait for the round following provided one and return the latest round.
+
+    Algod responds earlier if the round isn't confirmed in about a minute.
+    """
+    return algod_client().status_after_block(round_number).get("last-round")
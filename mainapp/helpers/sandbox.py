@@ -0,0 +1,47 @@
+"""Calls of the sandbox's command line tools."""
+import io
+import os
+import subprocess
+from pathlib import Path
+
+from .. import metrics
+
+
+def _call_sandbox_command(*args):
+    """Call and return sandbox command composed from provided arguments."""
+    return subprocess.Popen(
+        [_sandbox_executable(), *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+
+def _sandbox_executable():
+    """Return full path to Algorand's sandbox executable.
+
+    The location of sandbox directory is retrieved either from the SANDBOX_DIR
+    environment variable or if it's not set then the location of sandbox directory
+    is implied to be the sibling of this Django project in the directory tree.
+    """
+    sandbox_dir = os.environ.get("SANDBOX_DIR") or str(
+        Path(__file__).resolve().parents[3] / "sandbox"
+    )
+    return sandbox_dir + "/sandbox"
+
+
+def cli_passphrase_for_account(address):
+    """Return passphrase for provided address."""
+    with metrics.timed("goal", "account_export"):
+        process = _call_sandbox_command("goal", "account", "export", "-a", address)
+        output = [line for line in io.TextIOWrapper(process.stdout)]
+    passphrase = ""
+    for line in output:
+        parts = line.split('"')
+        if len(parts) > 1:
+            passphrase = parts[1]
+    if passphrase == "":
+        raise ValueError(
+            "Can't retrieve passphrase from the address: %s\nOutput: %s"
+            % (address, output)
+        )
+    return passphrase
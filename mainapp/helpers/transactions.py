@@ -0,0 +1,99 @@
+"""Signing and sending of the payment transactions."""
+import time
+
+from algosdk import mnemonic
+from algosdk.error import WrongChecksumError
+from algosdk.future.transaction import PaymentTxn
+
+from ..signing import sign_batch
+from .clients import algod_client, algod_response
+
+
+def wait_for_confirmation(client, transaction_id, timeout):
+    """
+    Wait until the transaction is confirmed or rejected, or until 'timeout'
+    number of rounds have passed.
+    Args:
+        transaction_id (str): the transaction to wait for
+        timeout (int): maximum number of rounds to wait
+    Returns:
+        dict: pending transaction information, or throws an error if the transaction
+            is not confirmed or rejected in the next timeout rounds
+    """
+    start_round = client.status()["last-round"] + 1
+    current_round = start_round
+
+    while current_round < start_round + timeout:
+        pending_txn = algod_response(client.pending_transaction_info, transaction_id)
+        if pending_txn.get("confirmed-round", 0) > 0:
+            return pending_txn
+        elif pending_txn.get("pool-error"):
+            raise Exception("pool error: {}".format(pending_txn["pool-error"]))
+        client.status_after_block(current_round)
+        current_round += 1
+    raise Exception(
+        "pending tx not found in timeout rounds, timeout value = : {}".format(timeout)
+    )
+
+
+def add_transaction(sender, receiver, passphrase, amount, note, timings=None):
+    """Create and sign transaction from provided arguments.
+
+    Returned non-empty tuple carries field where error was raised and description.
+    If the first item is None then the error is non-field/integration error.
+    Returned two-tuple of empty strings marks successful transaction.
+
+    If provided, `timings` dictionary is updated with transaction's submission
+    and confirmation durations in seconds.
+    """
+
+    client = algod_client(primary=True)
+    params = client.suggested_params()
+    unsigned_txn = PaymentTxn(sender, params, receiver, amount, None, note.encode())
+    try:
+        signed_txn = unsigned_txn.sign(mnemonic.to_private_key(passphrase))
+    except WrongChecksumError:
+        return "passphrase", "Checksum failed to validate"
+    except ValueError:
+        return "passphrase", "Unknown word in passphrase"
+
+    try:
+        start = time.perf_counter()
+        transaction_id = client.send_transaction(signed_txn)
+        submitted = time.perf_counter()
+        wait_for_confirmation(client, transaction_id, 4)
+    except Exception as err:
+        return None, err  # None implies non-field error
+
+    if timings is not None:
+        timings["submit"] = submitted - start
+        timings["confirm"] = time.perf_counter() - submitted
+    return "", ""
+
+
+def add_transactions(payments):
+    """Create payment transactions, sign them in a batch and send them.
+
+    Every payment is a tuple of sender, receiver, sender's passphrase or private
+    key, amount and note. Returned two-tuple follows `add_transaction` convention.
+    """
+    client = algod_client(primary=True)
+    params = client.suggested_params()
+    items = [
+        (PaymentTxn(sender, params, receiver, amount, None, note.encode()), key)
+        for sender, receiver, key, amount, note in payments
+    ]
+    try:
+        groups = sign_batch(items)
+    except WrongChecksumError:
+        return "passphrase", "Checksum failed to validate"
+    except ValueError:
+        return "passphrase", "Unknown word in passphrase"
+
+    try:
+        transaction_ids = [client.send_transactions(group) for group in groups]
+        for transaction_id in transaction_ids:
+            wait_for_confirmation(client, transaction_id, 4)
+    except Exception as err:
+        return None, err
+    return "", ""
@@ -0,0 +1,202 @@
+import time
+
+from algosdk import account
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from mainapp.metrics import percentile
+from mainapp.models import Account, Asset, Wallet, WalletAccount
+from mainapp.stubnode import StubNode
+
+VIEWS = (
+    "index",
+    "standalone_account",
+    "wallet",
+    "search",
+    "transfer_funds",
+    "create_asset",
+)
+REDIRECTING_VIEWS = ("transfer_funds", "create_asset")
+
+
+class Command(BaseCommand):
+    help = "Benchmark the main views against a local stub node."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--accounts",
+            default="10,100,1000",
+            help="comma-separated numbers of accounts to benchmark with",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=20, help="number of requests per view"
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=5.0,
+            help="stub node latency in milliseconds",
+        )
+        parser.add_argument(
+            "--transactions",
+            type=int,
+            default=20,
+            help="number of transactions in the history of every account",
+        )
+        parser.add_argument(
+            "--views",
+            default=",".join(VIEWS),
+            help="comma-separated views to benchmark",
+        )
+
+    def handle(self, *args, **options):
+        views = options["views"].split(",")
+        unknown = set(views) - set(VIEWS)
+        if unknown:
+            self.stderr.write("Unknown views: %s" % ", ".join(sorted(unknown)))
+            return
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with StubNode(
+                latency=options["latency"] / 1000,
+                transactions=options["transactions"],
+            ) as node, override_settings(**node.settings()):
+                self.stdout.write(
+                    "%-20s %8s %10s %10s %10s %10s %8s"
+                    % (
+                        "view",
+                        "accounts",
+                        "req/s",
+                        "p50 ms",
+                        "p99 ms",
+                        "calls/req",
+                        "errors",
+                    )
+                )
+                for count in (int(val) for val in options["accounts"].split(",")):
+                    self._populate(count)
+                    for view in views:
+                        self._benchmark(node, view, count, options["requests"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def _populate(self, count):
+        """Recreate database rows with provided number of accounts."""
+        Asset.objects.all().delete()
+        Wallet.objects.all().delete()
+        Account.objects.all().delete()
+
+        Account.objects.bulk_create(
+            Account(address=address, private_key=private_key)
+            for private_key, address in (
+                account.generate_account() for _ in range(count)
+            )
+        )
+        wallet = Wallet.objects.create(
+            wallet_id="benchmark", name="benchmark", password="benchmark1"
+        )
+        self._populate_wallet(wallet, count)
+
+    def _populate_wallet(self, wallet, count):
+        """Create provided number of accounts in provided wallet.
+
+        Multi-table inherited models can't be bulk created, so the parent
+        accounts are bulk created first and then linked to the wallet by a
+        single insert of the child rows.
+        """
+        Account.objects.bulk_create(
+            Account(address=address)
+            for _, address in (account.generate_account() for _ in range(count))
+        )
+        ids = Account.objects.order_by("-id").values_list("id", flat=True)[:count]
+        meta = WalletAccount._meta
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO %s (%s, %s) VALUES (%%s, %%s)"
+                % tuple(
+                    connection.ops.quote_name(name)
+                    for name in (
+                        meta.db_table,
+                        meta.pk.column,
+                        meta.get_field("wallet").column,
+                    )
+                ),
+                [(account_id, wallet.pk) for account_id in ids],
+            )
+
+    def _request(self, view):
+        """Return three-tuple of method, URL and data for provided view's request."""
+        sender, receiver = Account.objects.exclude(walletaccount__isnull=False)[:2]
+        if view == "index":
+            return "get", "/", None
+        if view == "standalone_account":
+            return "get", "/standalone-account/%s/" % (sender.address,), None
+        if view == "wallet":
+            return "get", "/wallet/%s/" % (Wallet.objects.get().wallet_id,), None
+        if view == "search":
+            return "post", "/search/", {"address": sender.address}
+        if view == "transfer_funds":
+            return (
+                "post",
+                "/transfer-funds/%s/" % (sender.address,),
+                {
+                    "passphrase": sender.passphrase,
+                    "receiver": receiver.address,
+                    "amount": 1000,
+                    "note": "Benchmark",
+                    "submit": "Submit",
+                },
+            )
+        return (
+            "post",
+            "/create-asset/",
+            {
+                "creator": sender.address,
+                "name": "Benchmark",
+                "unit": "BENCH",
+                "total": 1000,
+                "decimals": 0,
+                "passphrase": sender.passphrase,
+                "submit": "Submit",
+            },
+        )
+
+    def _benchmark(self, node, view, count, requests):
+        """Send provided number of requests to the view and write the results."""
+        client = Client()
+        method, url, data = self._request(view)
+        expected_status = 302 if view in REDIRECTING_VIEWS else 200
+        latencies = []
+        errors = 0
+        calls = node.calls
+        start = time.perf_counter()
+        for _ in range(requests):
+            request_start = time.perf_counter()
+            response = getattr(client, method)(url, data)
+            latencies.append(time.perf_counter() - request_start)
+            if response.status_code != expected_status:
+                errors += 1
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            "%-20s %8d %10.1f %10.1f %10.1f %10.1f %8d"
+            % (
+                view,
+                count,
+                requests / elapsed,
+                percentile(latencies, 50) * 1000,
+                percentile(latencies, 99) * 1000,
+                (node.calls - calls) / requests,
+                errors,
+            )
+        )
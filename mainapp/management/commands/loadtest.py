@@ -0,0 +1,138 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from algosdk import account, mnemonic
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from mainapp.helpers import (
+    add_transaction,
+    add_transactions,
+    cli_passphrase_for_account,
+    initial_funds_sender,
+)
+from mainapp.metrics import percentile
+from mainapp.stubnode import StubNode
+
+
+class Command(BaseCommand):
+    help = "Measure payments throughput by concurrent transfers between new accounts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--accounts", type=int, default=10, help="number of funded accounts"
+        )
+        parser.add_argument(
+            "--transfers", type=int, default=100, help="number of transfers"
+        )
+        parser.add_argument(
+            "--workers", type=int, default=8, help="number of concurrent workers"
+        )
+        parser.add_argument(
+            "--funds",
+            type=int,
+            default=10000000,
+            help="initial funds of every account in microAlgos",
+        )
+        parser.add_argument(
+            "--amount",
+            type=int,
+            default=1000,
+            help="amount of every transfer in microAlgos",
+        )
+        parser.add_argument(
+            "--stub",
+            action="store_true",
+            help="run against a local stub node instead of the configured one",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=5.0,
+            help="stub node latency in milliseconds",
+        )
+
+    def handle(self, *args, **options):
+        with ExitStack() as stack:
+            if options["stub"]:
+                node = stack.enter_context(StubNode(latency=options["latency"] / 1000))
+                stack.enter_context(override_settings(**node.settings()))
+                funder, funder_passphrase = node.funder, node.funder_passphrase
+            else:
+                funder = initial_funds_sender()
+                if funder is None:
+                    raise CommandError("There's no account to fund the accounts from!")
+                funder_passphrase = cli_passphrase_for_account(funder)
+
+            accounts = self._fund_accounts(funder, funder_passphrase, options)
+            with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+                self._transfer(executor, accounts, options)
+
+    def _fund_accounts(self, funder, funder_passphrase, options):
+        """Create funded accounts and return their addresses and passphrases."""
+        accounts = []
+        for _ in range(options["accounts"]):
+            private_key, address = account.generate_account()
+            accounts.append((address, mnemonic.from_private_key(private_key)))
+
+        field, error = add_transactions(
+            [
+                (
+                    funder,
+                    address,
+                    funder_passphrase,
+                    options["funds"],
+                    "Load test funds",
+                )
+                for address, _ in accounts
+            ]
+        )
+        if field != "":
+            raise CommandError("Accounts funding failed: %s" % (error,))
+
+        self.stdout.write("Funded %d accounts." % (len(accounts),))
+        return accounts
+
+    def _transfer(self, executor, accounts, options):
+        """Run concurrent transfers between provided accounts and write results."""
+        transfers = [
+            (*random.sample(accounts, 2), options["amount"])
+            for _ in range(options["transfers"])
+        ]
+
+        def transfer(args):
+            (sender, passphrase), (receiver, _), amount = args
+            timings = {}
+            field, error = add_transaction(
+                sender, receiver, passphrase, amount, "Load test", timings
+            )
+            return timings, error if field != "" else None
+
+        start = time.perf_counter()
+        results = list(executor.map(transfer, transfers))
+        elapsed = time.perf_counter() - start
+
+        submits = [timings["submit"] for timings, error in results if error is None]
+        confirms = [timings["confirm"] for timings, error in results if error is None]
+        errors = [error for _, error in results if error is not None]
+
+        self.stdout.write(
+            "Transfers: %d, succeeded: %d, failed: %d, workers: %d"
+            % (len(results), len(submits), len(errors), options["workers"])
+        )
+        self.stdout.write("Throughput: %.1f payments/s" % (len(submits) / elapsed,))
+        if submits:
+            for name, values in (("Submit", submits), ("Confirmation", confirms)):
+                self.stdout.write(
+                    "%s latency: p50 %.1f ms, p99 %.1f ms, max %.1f ms"
+                    % (
+                        name,
+                        percentile(values, 50) * 1000,
+                        percentile(values, 99) * 1000,
+                        max(values) * 1000,
+                    )
+                )
+        for error in errors[:5]:
+            self.stderr.write("Failed transfer: %s" % (error,))
@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from mainapp.refresh import refresh_accounts
+
+
+class Command(BaseCommand):
+    help = "Refresh stored balances and activity of all the accounts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.BALANCE_REFRESH_BATCH_SIZE,
+            help="number of accounts refreshed by a single update",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="keep refreshing every BALANCE_REFRESH_INTERVAL seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.perf_counter()
+            refreshed, changed = refresh_accounts(options["batch_size"])
+            self.stdout.write(
+                "Refreshed %d accounts, %d changed, in %.2f s."
+                % (refreshed, changed, time.perf_counter() - start)
+            )
+            if not options["loop"]:
+                break
+            time.sleep(settings.BALANCE_REFRESH_INTERVAL)
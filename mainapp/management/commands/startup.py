@@ -0,0 +1,58 @@
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+LOAD_APPLICATION = (
+    "import sys; import algodjango.%s; "
+    "print(','.join(module for module in ('algosdk', 'numpy') "
+    "if module in sys.modules))"
+)
+TARGETS = {
+    "check": ["manage.py", "check"],
+    "migrate --plan": ["manage.py", "migrate", "--plan"],
+    "wsgi": ["-c", LOAD_APPLICATION % ("wsgi",)],
+    "asgi": ["-c", LOAD_APPLICATION % ("asgi",)],
+}
+
+
+class Command(BaseCommand):
+    help = "Measure cold startup times of management commands and applications."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs", type=int, default=5, help="number of runs per target"
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            "%-16s %10s %10s  %s" % ("target", "min ms", "p50 ms", "heavy imports")
+        )
+        for name, arguments in TARGETS.items():
+            durations = []
+            for _ in range(options["runs"]):
+                start = time.perf_counter()
+                process = subprocess.run(
+                    [sys.executable, *arguments],
+                    cwd=settings.BASE_DIR,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                )
+                durations.append(time.perf_counter() - start)
+                if process.returncode != 0:
+                    self.stderr.write("%s failed:\n%s" % (name, process.stderr))
+                    break
+            imports = process.stdout.strip() if arguments[0] == "-c" else ""
+            self.stdout.write(
+                "%-16s %10.0f %10.0f  %s"
+                % (
+                    name,
+                    min(durations) * 1000,
+                    statistics.median(durations) * 1000,
+                    imports or "-" if arguments[0] == "-c" else "",
+                )
+            )
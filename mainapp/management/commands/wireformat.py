@@ -0,0 +1,73 @@
+import time
+
+from algosdk.v2client import algod
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from mainapp import wire
+from mainapp.helpers.retrieving import block_transactions
+from mainapp.metrics import percentile
+from mainapp.stubnode import STUB_TOKEN, StubNode
+
+FORMATS = ("json", "msgpack")
+
+
+class Command(BaseCommand):
+    help = "Compare JSON and msgpack algod responses on large blocks of a stub node."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--transactions",
+            default="1000,10000",
+            help="comma-separated numbers of transactions in the block",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="number of runs per format"
+        )
+
+    def handle(self, *args, **options):
+        for transactions in options["transactions"].split(","):
+            with StubNode(transactions=int(transactions)) as node:
+                self.stdout.write("Block with %s transactions:" % (transactions,))
+                for response_format in FORMATS:
+                    self._measure(node, response_format, options["repeat"])
+
+    def _measure(self, node, response_format, repeat):
+        """Write payload size, decoding and request times of provided format."""
+        client = algod.AlgodClient(STUB_TOKEN, node.url)
+        payload = client.algod_request(
+            "GET",
+            "/blocks/%s" % (node.round,),
+            {"format": response_format},
+            response_format="raw",
+        )
+
+        parsing, decoding = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            block = wire.decode(payload, response_format)["block"]
+            parsing.append(time.perf_counter() - start)
+            rows = wire.block_rows(block, node.round)
+            decoding.append(time.perf_counter() - start)
+
+        requests = []
+        with override_settings(
+            **node.settings(), ALGOD_RESPONSE_FORMAT=response_format
+        ):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                block_transactions(node.round)
+                requests.append(time.perf_counter() - start)
+
+        self.stdout.write(
+            "  %-8s payload %8.1f KiB, %d rows, parsing p50 %7.2f ms, "
+            "decoding to rows p50 %7.2f ms, request p50 %7.2f ms"
+            % (
+                response_format,
+                len(payload) / 1024,
+                len(rows),
+                percentile(parsing, 50) * 1000,
+                percentile(decoding, 50) * 1000,
+                percentile(requests, 50) * 1000,
+            )
+        )
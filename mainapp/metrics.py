@@ -0,0 +1,170 @@
+"""Timing and counting of the calls made to Algorand backends.
+
+Every call to algod, indexer, kmd or the sandbox's `goal` command is recorded
+in a latency histogram per backend endpoint, together with the number of
+failed calls. Calls made while a request is being processed are also
+collected for that request, so the number of backend calls per view can be
+tracked and the `Server-Timing` header can be added to the response.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CALLS_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+_lock = threading.Lock()
+_latencies = {}
+_errors = {}
+_calls_per_request = {}
+_request_calls = ContextVar("request_calls", default=None)
+
+
+class _Histogram:
+    """Cumulative histogram with fixed upper bounds."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Add provided value to the histogram."""
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def lines(self, name, labels):
+        """Return histogram's lines in Prometheus text exposition format."""
+        lines = [
+            '%s_bucket{%s,le="%s"} %d' % (name, labels, bound, count)
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        lines.append('%s_bucket{%s,le="+Inf"} %d' % (name, labels, self.count))
+        lines.append("%s_sum{%s} %s" % (name, labels, round(self.sum, 6)))
+        lines.append("%s_count{%s} %d" % (name, labels, self.count))
+        return lines
+
+
+## RECORDING
+def record(backend, endpoint, duration, error=False):
+    """Record a single call to provided backend's endpoint."""
+    key = (backend, endpoint)
+    with _lock:
+        if key not in _latencies:
+            _latencies[key] = _Histogram(LATENCY_BUCKETS)
+            _errors[key] = 0
+        _latencies[key].observe(duration)
+        if error:
+            _errors[key] += 1
+
+    calls = _request_calls.get()
+    if calls is not None:
+        calls.append((backend, endpoint, duration))
+
+
+@contextmanager
+def timed(backend, endpoint):
+    """Context manager recording duration and outcome of the enclosed call."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        record(backend, endpoint, time.perf_counter() - start, error=True)
+        raise
+    record(backend, endpoint, time.perf_counter() - start)
+
+
+def start_request():
+    """Start collecting backend calls for the current request."""
+    return _request_calls.set([])
+
+
+def finish_request(token):
+    """Stop collecting backend calls and return the ones made in the request."""
+    calls = _request_calls.get() or []
+    _request_calls.reset(token)
+    return calls
+
+
+def record_request(view, calls):
+    """Record the number of backend calls made by provided view."""
+    with _lock:
+        if view not in _calls_per_request:
+            _calls_per_request[view] = _Histogram(CALLS_BUCKETS)
+        _calls_per_request[view].observe(len(calls))
+
+
+## REPORTING
+def percentile(values, percent):
+    """Return provided percentile of the values by the nearest-rank method."""
+    ordered = sorted(values)
+    index = max(0, int(round(percent / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+def server_timing(calls):
+    """Return `Server-Timing` header value summarizing provided calls by backend."""
+    backends = {}
+    for backend, _, duration in calls:
+        count, total = backends.get(backend, (0, 0.0))
+        backends[backend] = (count + 1, total + duration)
+    return ", ".join(
+        '%s;dur=%.1f;desc="%d calls"' % (backend, total * 1000, count)
+        for backend, (count, total) in sorted(backends.items())
+    )
+
+
+def render():
+    """Return all the collected metrics in Prometheus text exposition format."""
+    with _lock:
+        lines = [
+            "# HELP algodjango_backend_call_seconds Latency of backend calls.",
+            "# TYPE algodjango_backend_call_seconds histogram",
+        ]
+        for (backend, endpoint), histogram in sorted(_latencies.items()):
+            lines.extend(
+                histogram.lines(
+                    "algodjango_backend_call_seconds",
+                    'backend="%s",endpoint="%s"' % (backend, endpoint),
+                )
+            )
+
+        lines.extend(
+            [
+                "# HELP algodjango_backend_call_errors_total Failed backend calls.",
+                "# TYPE algodjango_backend_call_errors_total counter",
+            ]
+        )
+        lines.extend(
+            'algodjango_backend_call_errors_total{backend="%s",endpoint="%s"} %d'
+            % (backend, endpoint, count)
+            for (backend, endpoint), count in sorted(_errors.items())
+        )
+
+        lines.extend(
+            [
+                "# HELP algodjango_backend_calls_per_request Backend calls per request.",
+                "# TYPE algodjango_backend_calls_per_request histogram",
+            ]
+        )
+        for view, histogram in sorted(_calls_per_request.items()):
+            lines.extend(
+                histogram.lines(
+                    "algodjango_backend_calls_per_request", 'view="%s"' % (view,)
+                )
+            )
+
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """Clear all the collected metrics."""
+    with _lock:
+        _latencies.clear()
+        _errors.clear()
+        _calls_per_request.clear()
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.shortcuts import render
+
+from . import metrics
+from .resilience import BackendUnavailable
+
+
+class BackendTimingMiddleware:
+    """Collect backend calls made by the view and report them in the response.
+
+    The time spent in every backend is added to the response through the
+    `Server-Timing` header and the number of calls is recorded per view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            calls = metrics.finish_request(token)
+
+        match = request.resolver_match
+        metrics.record_request(
+            (match.url_name or match.view_name) if match else "", calls
+        )
+        if calls:
+            response["Server-Timing"] = metrics.server_timing(calls)
+        return response
+
+
+class BackendUnavailableMiddleware:
+    """Render degraded page when a backend needed by the view is unavailable."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, BackendUnavailable):
+            return None
+        response = render(
+            request,
+            "mainapp/degraded.html",
+            {"backend": exception.backend},
+            status=503,
+        )
+        response["Retry-After"] = str(settings.CIRCUIT_BREAKER_COOLDOWN)
+        return response
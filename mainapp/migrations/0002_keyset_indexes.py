@@ -0,0 +1,25 @@
+# Generated by Django 3.2.25 on 2026-10-19 18:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['created', 'id'], name='account_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['created', 'id'], name='asset_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wallet',
+            index=models.Index(fields=['name', 'id'], name='wallet_name_id_idx'),
+        ),
+    ]
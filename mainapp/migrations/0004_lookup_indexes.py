@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-19 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0003_account_stored_balance'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='account',
+            name='address',
+            field=models.CharField(db_index=True, max_length=58),
+        ),
+        migrations.AlterField(
+            model_name='asset',
+            name='asset_id',
+            field=models.IntegerField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='asset',
+            name='creator',
+            field=models.CharField(db_index=True, max_length=58),
+        ),
+        migrations.AlterField(
+            model_name='wallet',
+            name='wallet_id',
+            field=models.CharField(db_index=True, max_length=32),
+        ),
+    ]
@@ -1,18 +1,28 @@
-from algosdk.constants import address_len, hash_len, max_asset_decimals, metadata_length
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.http import Http404
 
-from .helpers import account_balance, account_transactions, passphrase_from_private_key
+from . import helpers
+from .constants import address_len, hash_len, max_asset_decimals, metadata_length
 
 
 class Account(models.Model):
     """Base model class for standalone and wallet Algorand accounts."""
 
-    address = models.CharField(max_length=address_len)
+    address = models.CharField(max_length=address_len, db_index=True)
     private_key = models.CharField(max_length=address_len + hash_len)
     created = models.DateTimeField(auto_now_add=True)
+    balance = models.BigIntegerField(null=True, blank=True)
+    last_round = models.BigIntegerField(null=True, blank=True)
+    last_activity = models.DateTimeField(null=True, blank=True)
+    refreshed = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created", "id"], name="account_created_id_idx"),
+            models.Index(fields=["balance"], name="account_balance_idx"),
+        ]
 
     @classmethod
     def instance_from_address(cls, address):
@@ -22,18 +32,18 @@ class Account(models.Model):
         except ObjectDoesNotExist:
             raise Http404
 
-    def balance(self):
-        """Return this instance's balance in microAlgos."""
-        return account_balance(self.address)
+    def current_balance(self):
+        """Return this instance's balance in microAlgos retrieved from the node."""
+        return helpers.account_balance(self.address)
 
     @property
     def passphrase(self):
         """Return account's mnemonic."""
-        return passphrase_from_private_key(self.private_key)
+        return helpers.passphrase_from_private_key(self.private_key)
 
     def transactions(self):
         """Return all the transactions involving this account."""
-        return account_transactions(self.address)
+        return helpers.account_transactions(self.address)
 
     def __str__(self):
         """Account's human-readable string representation."""
@@ -43,8 +53,8 @@ class Account(models.Model):
 class Asset(models.Model):
     """Model class for Algorand assets."""
 
-    asset_id = models.IntegerField(blank=False)
-    creator = models.CharField(max_length=address_len, blank=False)
+    asset_id = models.IntegerField(blank=False, db_index=True)
+    creator = models.CharField(max_length=address_len, blank=False, db_index=True)
     name = models.CharField(max_length=hash_len, blank=True)
     unit = models.CharField(max_length=8, blank=True)
     total = models.IntegerField(
@@ -64,6 +74,9 @@ class Asset(models.Model):
     clawback = models.CharField(max_length=address_len, blank=True)
     created = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["created", "id"], name="asset_created_id_idx")]
+
     def __str__(self):
         """Asset's human-readable string representation."""
         return self.name
@@ -72,11 +85,14 @@ class Asset(models.Model):
 class Wallet(models.Model):
     """Model class for wallets."""
 
-    wallet_id = models.CharField(max_length=hash_len)
+    wallet_id = models.CharField(max_length=hash_len, db_index=True)
     name = models.CharField(max_length=50)
     password = models.CharField(max_length=50)
     created = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["name", "id"], name="wallet_name_id_idx")]
+
     @classmethod
     def instance_from_id(cls, wallet_id):
         """Return model instance from provided wallet's ID."""
@@ -0,0 +1,150 @@
+"""Pools of algod, indexer and kmd nodes with health-aware routing.
+
+Reads are routed to the healthy node with the fewest calls in flight among
+the nodes that are caught up with the most advanced one, while transaction
+submission is pinned to the primary (first configured) node and fails over
+to the next healthy node only when the primary is down. Node health and
+rounds are checked in a background thread every HEALTH_CHECK_INTERVAL
+seconds, triggered by the routing itself.
+"""
+import importlib
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from . import resilience
+
+CLIENT_CLASSES = {
+    "algod": "mainapp.sdkclients.AlgodClient",
+    "indexer": "mainapp.sdkclients.IndexerClient",
+    "kmd": "mainapp.sdkclients.KMDClient",
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class Node:
+    """Single backend node with its health state."""
+
+    def __init__(self, backend, address, token):
+        self.backend = backend
+        self.address = address
+        self.token = token
+        self.healthy = True
+        self.round = 0
+        self.in_flight = 0
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Return SDK client of this node, instantiating it on the first use."""
+        if self._client is None:
+            module, name = CLIENT_CLASSES[self.backend].rsplit(".", 1)
+            client_class = getattr(importlib.import_module(module), name)
+            self._client = client_class(self.token, self.address)
+        return self._client
+
+    @property
+    def available(self):
+        """Return True if this node is healthy and its circuit is closed."""
+        return self.healthy and not resilience.breaker(self.address).is_open
+
+    @contextmanager
+    def call(self):
+        """Context manager counting the enclosed call as in flight."""
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def check(self):
+        """Update this node's health and round."""
+        try:
+            if self.backend == "algod":
+                self.round = resilience.call(
+                    self.backend, "status", self.client.status, circuit=self.address
+                ).get("last-round", 0)
+            else:
+                self.round = resilience.call(
+                    self.backend, "health", self.client.health, circuit=self.address
+                ).get("round", 0)
+            self.healthy = True
+        except Exception:
+            self.healthy = False
+
+
+class NodePool:
+    """Nodes of a single backend routing the calls among them."""
+
+    def __init__(self, backend, addresses, token):
+        self.backend = backend
+        self.nodes = [Node(backend, address, token) for address in addresses]
+        self.checked_at = 0
+        self._checking = threading.Lock()
+
+    def _check(self):
+        """Check all the nodes and release the checking lock."""
+        try:
+            for node in self.nodes:
+                node.check()
+        finally:
+            self.checked_at = time.monotonic()
+            self._checking.release()
+
+    def _refresh(self):
+        """Start nodes check in the background if the last check is outdated."""
+        if time.monotonic() - self.checked_at < settings.HEALTH_CHECK_INTERVAL:
+            return
+        if self._checking.acquire(blocking=False):
+            threading.Thread(target=self._check, daemon=True).start()
+
+    def primary(self):
+        """Return primary node, or the first available node if primary is down."""
+        if len(self.nodes) > 1:
+            self._refresh()
+        return next((node for node in self.nodes if node.available), self.nodes[0])
+
+    def reader(self, exclude=None):
+        """Return the least loaded among the available and caught-up nodes.
+
+        Provided `exclude` node is returned only if there's no other candidate,
+        so a hedging call is sent to a different node than the hedged one.
+        """
+        if len(self.nodes) == 1:
+            return self.nodes[0]
+        self._refresh()
+        available = [node for node in self.nodes if node.available]
+        if not available:
+            return self.nodes[0]
+        latest_round = max(node.round for node in available)
+        candidates = [
+            node
+            for node in available
+            if node.round >= latest_round - settings.NODE_MAX_LAG
+        ]
+        if exclude is not None and len(candidates) > 1:
+            candidates = [node for node in candidates if node is not exclude]
+        random.shuffle(candidates)
+        return min(candidates, key=lambda node: node.in_flight)
+
+
+def pool(backend):
+    """Return nodes pool of provided backend from the current settings."""
+    addresses, token = {
+        "algod": (settings.ALGOD_ADDRESSES, settings.ALGOD_TOKEN),
+        "indexer": (settings.INDEXER_ADDRESSES, settings.INDEXER_TOKEN),
+        "kmd": ([settings.KMD_ADDRESS], settings.KMD_TOKEN),
+    }[backend]
+    key = (backend, tuple(addresses), token)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = NodePool(backend, addresses, token)
+        return _pools[key]
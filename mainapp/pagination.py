@@ -0,0 +1,103 @@
+"""Keyset pagination of the list views.
+
+Instead of counting rows and skipping them by offset, the page is seeked by
+the ordering values of the last (or first) row from the previous page, so
+every page is fetched by the same index range scan regardless of its depth.
+Cursors in the `after` and `before` query parameters carry those values.
+"""
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+
+class KeysetPage:
+    """Page of model instances with the cursors of adjacent pages."""
+
+    def __init__(self, items, ordering, has_previous, has_next):
+        self.items = items
+        self.ordering = ordering
+        self.has_previous = has_previous and bool(items)
+        self.has_next = has_next and bool(items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def next_cursor(self):
+        """Return cursor of the page following this page."""
+        return _encode_cursor(self.items[-1], self.ordering) if self.has_next else ""
+
+    @property
+    def previous_cursor(self):
+        """Return cursor of the page preceding this page."""
+        return _encode_cursor(self.items[0], self.ordering) if self.has_previous else ""
+
+
+def _encode_cursor(instance, ordering):
+    """Return cursor made of provided instance's ordering values."""
+    values = [str(getattr(instance, field.lstrip("-"))) for field in ordering]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor(cursor, queryset, ordering):
+    """Return ordering values from provided cursor, raise 404 if it's invalid."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(ordering):
+            raise ValueError
+        return [
+            queryset.model._meta.get_field(field.lstrip("-")).to_python(value)
+            for field, value in zip(ordering, values)
+        ]
+    except (ValueError, TypeError, ValidationError):
+        raise Http404
+
+
+def _seek(queryset, ordering, values, forward):
+    """Filter queryset to the rows after (or before) provided ordering values.
+
+    The rows are selected by `a < x OR (a = x AND b < y)` condition, which is
+    ANDed with the leading `a <= x` bound that databases can use as the index
+    range to start the scan from.
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") == forward else "gt"
+        condition |= equal & Q(**{"%s__%s" % (name, lookup): value})
+        equal &= Q(**{name: value})
+    name = ordering[0].lstrip("-")
+    lookup = "lte" if ordering[0].startswith("-") == forward else "gte"
+    return queryset.filter(Q(**{"%s__%s" % (name, lookup): values[0]}), condition)
+
+
+def keyset_page(queryset, ordering, params, per_page=None):
+    """Return page of provided queryset based on the cursor from query params.
+
+    Ordering must end with a unique field, so every row has distinct values.
+    """
+    per_page = per_page or settings.LIST_PAGE_SIZE
+    reverse = ["-" + field if field[0] != "-" else field[1:] for field in ordering]
+
+    if params.get("before"):
+        values = _decode_cursor(params["before"], queryset, ordering)
+        rows = list(
+            _seek(queryset, ordering, values, False).order_by(*reverse)[: per_page + 1]
+        )
+        return KeysetPage(rows[:per_page][::-1], ordering, len(rows) > per_page, True)
+
+    if params.get("after"):
+        values = _decode_cursor(params["after"], queryset, ordering)
+        queryset = _seek(queryset, ordering, values, True)
+    rows = list(queryset.order_by(*ordering)[: per_page + 1])
+    return KeysetPage(
+        rows[:per_page], ordering, bool(params.get("after")), len(rows) > per_page
+    )
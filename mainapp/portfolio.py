@@ -0,0 +1,118 @@
+"""Portfolio summary of all the accounts' balances and asset holdings.
+
+Balances are read from the accounts' stored columns and the holdings of every
+asset are retrieved from the indexer a page of holders at a time, so the
+number of backend calls depends on the number of assets, not accounts. All
+the amounts are aggregated as NumPy arrays and the summary is cached for the
+current round together with the versions of the accounts and assets lists.
+"""
+import math
+
+import numpy as np
+from algosdk.constants import microalgos_to_algos_ratio
+from django.conf import settings
+from django.core.cache import cache
+
+from . import fragments, helpers
+from .models import Account, Asset
+
+
+def _distribution(values):
+    """Return counts of provided positive values by their order of magnitude."""
+    values = values[values > 0]
+    if not values.size:
+        return []
+    exponents = np.floor(np.log10(values)).astype(np.int64)
+    lowest = int(exponents.min())
+    counts = np.bincount(exponents - lowest)
+    return [
+        {"low": 10.0**exponent, "high": 10.0 ** (exponent + 1), "count": int(count)}
+        for exponent, count in enumerate(counts, start=lowest)
+        if count
+    ]
+
+
+def _holdings_array(addresses, order, holdings):
+    """Return array of provided holdings aligned with provided addresses.
+
+    `order` is the array of indexes sorting the addresses. Holders that aren't
+    among the addresses are ignored.
+    """
+    amounts = np.zeros(addresses.size, dtype=np.int64)
+    if not holdings or not addresses.size:
+        return amounts
+    holders = np.array(list(holdings.keys()))
+    values = np.fromiter(holdings.values(), dtype=np.int64, count=len(holdings))
+    positions = np.searchsorted(addresses, holders, sorter=order).clip(
+        0, addresses.size - 1
+    )
+    found = addresses[order[positions]] == holders
+    amounts[order[positions[found]]] = values[found]
+    return amounts
+
+
+def _summary(addresses, amounts, decimals):
+    """Return summary of provided amounts adjusted for provided decimals."""
+    values = amounts / 10**decimals
+    held = values[values > 0]
+    count = min(settings.PORTFOLIO_TOP_HOLDERS, held.size)
+    top = np.argpartition(-amounts, count - 1)[:count] if count else []
+    top = sorted(top, key=lambda index: -amounts[index])
+    return {
+        "total": int(amounts.sum()) / 10**decimals,
+        "holders": int(held.size),
+        "mean": float(held.mean()) if held.size else 0,
+        "median": float(np.median(held)) if held.size else 0,
+        "p90": float(np.percentile(held, 90)) if held.size else 0,
+        "distribution": _distribution(values),
+        "top_holders": [
+            {"address": str(addresses[index]), "amount": float(values[index])}
+            for index in top
+        ],
+    }
+
+
+def _portfolio():
+    """Return portfolio summary computed from the stored balances and indexer."""
+    rows = list(Account.objects.values_list("address", "balance"))
+    addresses = np.array([address for address, _ in rows], dtype=str)
+    balances = np.fromiter(
+        (balance or 0 for _, balance in rows), dtype=np.int64, count=len(rows)
+    )
+    order = np.argsort(addresses)
+
+    assets = list(
+        Asset.objects.order_by("asset_id").values(
+            "asset_id", "name", "unit", "decimals", "total"
+        )
+    )
+    holdings = helpers.assets_holdings([asset["asset_id"] for asset in assets])
+    for asset in assets:
+        amounts = _holdings_array(addresses, order, holdings[asset["asset_id"]])
+        asset.update(_summary(addresses, amounts, asset["decimals"]))
+        asset["share"] = (
+            100 * int(amounts.sum()) / asset["total"] if asset["total"] else 0
+        )
+
+    return {
+        "accounts": len(rows),
+        "algos": _summary(
+            addresses, balances, round(math.log10(microalgos_to_algos_ratio))
+        ),
+        "assets": assets,
+    }
+
+
+def portfolio_summary():
+    """Return portfolio summary of all the accounts, computed once per round."""
+    latest_round = helpers.current_round()
+    key = "portfolio:%s:%s:%s" % (
+        latest_round,
+        fragments.list_version("accounts"),
+        fragments.list_version("assets"),
+    )
+    summary = cache.get(key)
+    if summary is None:
+        summary = {"round": latest_round, **_portfolio()}
+        cache.set(key, summary, settings.FRAGMENT_CACHE_TIMEOUT)
+    return summary
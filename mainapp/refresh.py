@@ -0,0 +1,101 @@
+"""Refreshing of the accounts' stored balances and activity.
+
+The list views display the balances stored in the accounts' rows instead of
+retrieving them from the node on every request. Accounts are refreshed in
+batches of BALANCE_REFRESH_BATCH_SIZE rows: balances of the whole batch are
+retrieved concurrently, the latest transaction is looked up only for the
+accounts with changed balance, and only the changed rows are saved by a
+single `bulk_update` query. The refresh round and time of the unchanged rows
+are set by an `update` query per read round, usually one or two per batch.
+Cached lists are invalidated only if any balance changed, while the lists'
+refresh round and time are rendered outside of the cache.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils import timezone
+
+from . import fragments, helpers
+from .models import Account, WalletAccount
+
+
+def _refresh_batch(accounts, now):
+    """Refresh provided accounts and return IDs of the changed ones."""
+    states = helpers.account_states([account.address for account in accounts])
+    changed = []
+    unchanged = defaultdict(list)
+    for account in accounts:
+        balance, last_round = states[account.address]
+        if balance != account.balance or account.refreshed is None:
+            account.balance = balance
+            account.last_round = last_round
+            account.refreshed = now
+            changed.append(account)
+        else:
+            unchanged[last_round].append(account.id)
+
+    activities = helpers.account_last_activities(
+        [account.address for account in changed]
+    )
+    for account in changed:
+        account.last_activity = activities[account.address]
+    if changed:
+        Account.objects.bulk_update(
+            changed, ["balance", "last_round", "last_activity", "refreshed"]
+        )
+    for last_round, ids in unchanged.items():
+        Account.objects.filter(id__in=ids).update(last_round=last_round, refreshed=now)
+    return [account.id for account in changed]
+
+
+def _invalidate(changed_ids):
+    """Invalidate cached lists displaying provided accounts."""
+    wallets = dict(
+        WalletAccount.objects.filter(pk__in=changed_ids).values_list("pk", "wallet_id")
+    )
+    if len(wallets) < len(changed_ids):
+        fragments.invalidate("accounts")
+    for wallet_id in set(wallets.values()):
+        fragments.invalidate("wallet_accounts:%s" % (wallet_id,))
+
+
+def refresh_accounts(batch_size=None, queryset=None):
+    """Refresh stored balances and activity of provided accounts.
+
+    All the accounts are refreshed if `queryset` isn't provided. Return the
+    number of refreshed and changed accounts.
+    """
+    batch_size = batch_size or settings.BALANCE_REFRESH_BATCH_SIZE
+    queryset = (
+        (queryset if queryset is not None else Account.objects)
+        .only("address", "balance", "last_round", "last_activity", "refreshed")
+        .order_by("id")
+    )
+    refreshed = changed = 0
+    last_id = 0
+    while True:
+        accounts = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not accounts:
+            break
+        changed_ids = _refresh_batch(accounts, timezone.now())
+        if changed_ids:
+            _invalidate(changed_ids)
+        changed += len(changed_ids)
+        refreshed += len(accounts)
+        last_id = accounts[-1].id
+    return refreshed, changed
+
+
+def freshness_context(accounts):
+    """Return template context of provided accounts' stored balances freshness.
+
+    The oldest refresh round and time among the accounts are rendered outside
+    of the cached list, since they change on every refresh of the balances.
+    """
+    refreshed = [account for account in accounts if account.refreshed is not None]
+    if not refreshed:
+        return {}
+    return {
+        "balances_round": min(account.last_round or 0 for account in refreshed),
+        "balances_refreshed": min(account.refreshed for account in refreshed),
+    }
@@ -0,0 +1,240 @@
+"""Timeouts, retries, hedged reads and circuit breaking of the backend calls.
+
+Every backend call is run in a thread of its backend's pool and the caller
+waits for it only as long as the endpoint's timeout allows. The same timeout
+is set on the call's socket by the clients from `sdkclients`, so a stalled
+call releases its thread too, and a stalled backend can exhaust only its own
+pool. Long-polling calls are made in the calling thread instead, since
+they're meant to hold their connection for the whole timeout.
+
+Idempotent reads that fail with a transient error (connection error, timeout
+or server error) are retried with jittered exponential backoff and, if
+configured, hedged by a duplicate call once the first one is slower than the
+hedge delay. Backends failing repeatedly are cut off by their circuit breaker
+for a cooldown period, so the requests fail fast with `BackendUnavailable`
+instead of waiting on timeouts.
+"""
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+IDEMPOTENT_ENDPOINTS = {
+    "account_info",
+    "accounts",
+    "asset_balances",
+    "asset_info",
+    "block_info",
+    "health",
+    "list_keys",
+    "list_wallets",
+    "pending_transaction_info",
+    "search_transactions",
+    "search_transactions_by_address",
+    "status",
+    "status_after_block",
+    "suggested_params",
+}
+LONG_POLLING_ENDPOINTS = {"status_after_block"}
+
+_executors = {}
+_executors_lock = threading.Lock()
+_local = threading.local()
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+class BackendUnavailable(Exception):
+    """Backend doesn't respond or its circuit breaker is open."""
+
+    def __init__(self, backend, reason):
+        super().__init__("%s is unavailable: %s" % (backend, reason))
+        self.backend = backend
+
+
+class CircuitBreaker:
+    """Circuit breaker opening after a number of consecutive failures.
+
+    Open circuit rejects the calls until the cooldown passes, then a single
+    trial call is let through (half-open state) and its outcome either
+    closes the circuit again or opens it for another cooldown.
+    """
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        """Return True if the circuit currently rejects the calls."""
+        return self.opened_at is not None
+
+    def allow(self):
+        """Return True if a call is allowed through the circuit."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.trial or time.monotonic() < self.opened_at + self.cooldown:
+                return False
+            self.trial = True
+            return True
+
+    def success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+
+    def failure(self):
+        """Count a failed call and open the circuit if threshold is reached."""
+        with self._lock:
+            self.failures += 1
+            if self.trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial = False
+
+
+def breaker(name):
+    """Return circuit breaker of provided name, creating it on the first call."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                settings.CIRCUIT_BREAKER_THRESHOLD, settings.CIRCUIT_BREAKER_COOLDOWN
+            )
+        return _breakers[name]
+
+
+def _pool(backend):
+    """Return thread pool executor running provided backend's calls."""
+    with _executors_lock:
+        if backend not in _executors:
+            _executors[backend] = ThreadPoolExecutor(
+                max_workers=settings.BACKEND_POOL_SIZE,
+                thread_name_prefix="backend-%s" % (backend,),
+            )
+        return _executors[backend]
+
+
+def _setting(values, backend, endpoint):
+    """Return endpoint's value from provided setting, falling back to backend's."""
+    return values.get("%s.%s" % (backend, endpoint), values.get(backend))
+
+
+def socket_timeout(backend):
+    """Return socket timeout of the current thread's call to provided backend."""
+    timeout = getattr(_local, "timeout", None)
+    return timeout if timeout is not None else settings.BACKEND_TIMEOUTS[backend]
+
+
+def _timed_call(timeout, function, *args, **kwargs):
+    """Call provided function with provided socket timeout of its requests."""
+    previous = getattr(_local, "timeout", None)
+    _local.timeout = timeout
+    try:
+        return function(*args, **kwargs)
+    finally:
+        _local.timeout = previous
+
+
+def _is_transient(error):
+    """Return True if provided error is worth retrying and trips the breaker.
+
+    HTTP errors of all the backends carry their status in `code` attribute.
+    """
+    from algosdk.error import (
+        AlgodHTTPError,
+        AlgodResponseError,
+        IndexerHTTPError,
+        KMDHTTPError,
+    )
+
+    if isinstance(error, (OSError, AlgodResponseError)):
+        return True
+    return (
+        isinstance(error, (AlgodHTTPError, IndexerHTTPError, KMDHTTPError))
+        and (getattr(error, "code", None) or 0) >= 500
+    )
+
+
+def _attempt(backend, function, args, kwargs, timeout, hedge_delay, hedge):
+    """Return the result of the first call to complete successfully.
+
+    Hedging call is made by provided `hedge` function. Raise `TimeoutError`
+    if no call completes before the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    pool = _pool(backend)
+    futures = [pool.submit(_timed_call, timeout, function, *args, **kwargs)]
+    if hedge_delay is not None:
+        done, _ = wait(futures, timeout=min(hedge_delay, timeout))
+        if not done:
+            futures.append(pool.submit(_timed_call, timeout, hedge, *args, **kwargs))
+
+    error = None
+    while futures:
+        done, pending = wait(
+            futures,
+            timeout=max(0, deadline - time.monotonic()),
+            return_when=FIRST_COMPLETED,
+        )
+        if not done:
+            raise TimeoutError("no response in %s seconds" % (timeout,))
+        for future in done:
+            try:
+                return future.result()
+            except Exception as err:
+                error = err
+        futures = list(pending)
+    raise error
+
+
+def call(backend, endpoint, function, *args, circuit=None, hedge=None, **kwargs):
+    """Call provided backend function applying backend endpoint's policy.
+
+    Circuit breaker is selected by `circuit` name and defaults to backend's.
+    Hedging calls are made by `hedge` function, such as the same method of
+    another node, and by the called function itself if it isn't provided.
+    """
+    circuit_breaker = breaker(circuit or backend)
+    if not circuit_breaker.allow():
+        raise BackendUnavailable(backend, "circuit breaker is open")
+
+    idempotent = endpoint in IDEMPOTENT_ENDPOINTS
+    timeout = _setting(settings.BACKEND_TIMEOUTS, backend, endpoint)
+    hedge_delay = None
+    if idempotent and endpoint not in LONG_POLLING_ENDPOINTS:
+        hedge_delay = _setting(settings.BACKEND_HEDGE_DELAYS, backend, endpoint)
+    attempts = settings.BACKEND_RETRIES + 1 if idempotent else 1
+
+    for attempt in range(attempts):
+        try:
+            if endpoint in LONG_POLLING_ENDPOINTS:
+                result = _timed_call(timeout, function, *args, **kwargs)
+            else:
+                result = _attempt(
+                    backend,
+                    function,
+                    args,
+                    kwargs,
+                    timeout,
+                    hedge_delay,
+                    hedge or function,
+                )
+        except Exception as err:
+            if not _is_transient(err):
+                circuit_breaker.success()
+                raise
+            if attempt + 1 == attempts:
+                circuit_breaker.failure()
+                raise BackendUnavailable(backend, err) from err
+            time.sleep(random.uniform(0, settings.BACKEND_RETRY_BACKOFF * 2**attempt))
+        else:
+            circuit_breaker.success()
+            return result
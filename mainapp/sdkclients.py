@@ -0,0 +1,131 @@
+"""Algorand SDK clients whose requests time out.
+
+The SDK clients open their requests by `urlopen` without a timeout, so a
+stalled node would hold the calling thread for good. These clients make the
+same requests with the socket timeout of the endpoint being called, taken
+from `resilience.socket_timeout`. The HTTP status of a failed request is kept
+in the raised error's `code` attribute, which the SDK sets for algod only,
+so server errors of every backend are recognized as transient.
+"""
+import json
+from urllib import parse
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from algosdk import constants, error, kmd
+from algosdk.v2client import algod, indexer
+
+from .resilience import socket_timeout
+
+
+def _open(backend, module, address, requrl, method, params, data, headers, error_class):
+    """Return response of provided request, raise `error_class` on HTTP error.
+
+    Request URL is built the same way as by provided SDK client's module.
+    """
+    if requrl not in constants.unversioned_paths:
+        requrl = module.api_version_path_prefix + requrl
+    if params:
+        requrl = requrl + "?" + parse.urlencode(params)
+    request = Request(address + requrl, headers=headers, method=method, data=data)
+    try:
+        return urlopen(request, timeout=socket_timeout(backend))
+    except HTTPError as err:
+        body = err.read().decode("utf-8")
+        try:
+            message = json.loads(body)["message"]
+        except (ValueError, KeyError, TypeError):
+            message = body
+        http_error = error_class(message)
+        http_error.code = err.code
+        raise http_error from None
+
+
+def _sorted_dict(dictionary):
+    """Return provided dictionary recursively sorted by keys, as the SDK does."""
+    return {
+        key: _sorted_dict(value) if isinstance(value, dict) else value
+        for key, value in sorted(dictionary.items())
+    }
+
+
+class AlgodClient(algod.AlgodClient):
+    """Algod client with timed out requests."""
+
+    def algod_request(
+        self,
+        method,
+        requrl,
+        params=None,
+        data=None,
+        headers=None,
+        response_format="json",
+    ):
+        header = {"User-Agent": "py-algorand-sdk", **(self.headers or {})}
+        header.update(headers or {})
+        if requrl not in constants.no_auth:
+            header[constants.algod_auth_header] = self.algod_token
+        response = _open(
+            "algod",
+            algod,
+            self.algod_address,
+            requrl,
+            method,
+            params,
+            data,
+            header,
+            error.AlgodHTTPError,
+        )
+        if response_format != "json":
+            return response.read()
+        try:
+            return json.load(response)
+        except ValueError as err:
+            raise error.AlgodResponseError(
+                "Failed to parse JSON response from algod"
+            ) from err
+
+
+class IndexerClient(indexer.IndexerClient):
+    """Indexer client with timed out requests."""
+
+    def indexer_request(self, method, requrl, params=None, data=None, headers=None):
+        header = {"User-Agent": "py-algorand-sdk", **(self.headers or {})}
+        header.update(headers or {})
+        if requrl not in constants.no_auth and self.indexer_token:
+            header[constants.indexer_auth_header] = self.indexer_token
+        response = _open(
+            "indexer",
+            indexer,
+            self.indexer_address,
+            requrl,
+            method,
+            params,
+            data,
+            header,
+            error.IndexerHTTPError,
+        )
+        return _sorted_dict(json.loads(response.read().decode("utf-8")))
+
+
+class KMDClient(kmd.KMDClient):
+    """Kmd client with timed out requests."""
+
+    def kmd_request(self, method, requrl, params=None, data=None):
+        header = {}
+        if requrl not in constants.no_auth:
+            header[constants.kmd_auth_header] = self.kmd_token
+        if data:
+            data = json.dumps(data, indent=2).encode("utf-8")
+        response = _open(
+            "kmd",
+            kmd,
+            self.kmd_address,
+            requrl,
+            method,
+            params,
+            data,
+            header,
+            error.KMDHTTPError,
+        )
+        return json.loads(response.read().decode("utf-8"))
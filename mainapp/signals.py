@@ -0,0 +1,46 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from . import fragments
+from .models import Account, Asset, Wallet, WalletAccount
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Enable WAL journal mode for every new SQLite connection.
+
+    In WAL mode readers don't block the writer and vice versa, so concurrent
+    account creation requests wait on each other only for the write itself.
+    """
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode=WAL;")
+
+
+@receiver(post_save, sender=Account)
+def invalidate_accounts(sender, instance, created, **kwargs):
+    """Invalidate cached standalone accounts list after an account is created."""
+    if created:
+        fragments.invalidate("accounts")
+
+
+@receiver(post_save, sender=WalletAccount)
+def invalidate_wallet_accounts(sender, instance, created, **kwargs):
+    """Invalidate cached wallet accounts list after an account is created."""
+    if created:
+        fragments.invalidate("wallet_accounts:%s" % (instance.wallet_id,))
+
+
+@receiver(post_save, sender=Wallet)
+def invalidate_wallets(sender, instance, created, **kwargs):
+    """Invalidate cached wallets list after a wallet is created."""
+    if created:
+        fragments.invalidate("wallets")
+
+
+@receiver(post_save, sender=Asset)
+def invalidate_assets(sender, instance, created, **kwargs):
+    """Invalidate cached assets list after an asset is created."""
+    if created:
+        fragments.invalidate("assets")
@@ -0,0 +1,99 @@
+"""Batch signing of transactions in a pool of worker processes.
+
+Transactions of a batch are split into atomic groups of the maximum allowed
+size, so every returned group is sent to the network by a single
+`send_transactions` call. Every key reference from the batch is decoded to
+a private key only once and the signing itself is spread across the worker
+processes, leaving the request threads free to handle requests.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from algosdk import encoding, mnemonic
+from algosdk.constants import tx_group_limit
+from algosdk.future.transaction import assign_group_id
+from django.conf import settings
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    """Return process pool executor, creating it on the first call.
+
+    Workers are spawned instead of forked, since forking the multi-threaded
+    server process could copy locks held by its other threads.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.SIGNING_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _private_key(reference):
+    """Return private key from provided account's passphrase or private key."""
+    if " " in reference.strip():
+        return mnemonic.to_private_key(reference)
+    return reference
+
+
+def _sign_chunk(chunk):
+    """Sign provided pairs of encoded transaction and private key.
+
+    This function is run in the worker processes, so the transactions are
+    passed and returned msgpack encoded.
+    """
+    return [
+        encoding.msgpack_encode(encoding.future_msgpack_decode(txn).sign(private_key))
+        for txn, private_key in chunk
+    ]
+
+
+def sign_batch(items):
+    """Sign provided pairs of unsigned transaction and key reference.
+
+    Key reference is either passphrase or private key of the account that
+    signs the transaction. Return list of signed transaction groups, where
+    transactions in a group are confirmed or rejected together.
+
+    Provided transactions are grouped in the order given, even when they're
+    unrelated payments, and their group ID is set in place. A single rejected
+    payment thus fails all the other payments of its group of up to 16.
+    Invalid passphrase raises the `mnemonic` module's error before any
+    transaction is signed.
+    """
+    keys = {}
+    pairs = []
+    for txn, reference in items:
+        if reference not in keys:
+            keys[reference] = _private_key(reference)
+        pairs.append((txn, keys[reference]))
+
+    groups = [
+        pairs[index : index + tx_group_limit]
+        for index in range(0, len(pairs), tx_group_limit)
+    ]
+    for group in groups:
+        assign_group_id([txn for txn, _ in group])
+
+    encoded = [
+        (encoding.msgpack_encode(txn), private_key)
+        for group in groups
+        for txn, private_key in group
+    ]
+    if len(encoded) < settings.SIGNING_POOL_MIN_BATCH:
+        signed = _sign_chunk(encoded)
+    else:
+        size = -(-len(encoded) // settings.SIGNING_WORKERS)
+        chunks = [
+            encoded[index : index + size] for index in range(0, len(encoded), size)
+        ]
+        signed = [stxn for chunk in _pool().map(_sign_chunk, chunks) for stxn in chunk]
+
+    signed_txns = iter(encoding.future_msgpack_decode(stxn) for stxn in signed)
+    return [[next(signed_txns) for _ in group] for group in groups]
@@ -0,0 +1,34 @@
+// Update account's balance and transactions table from the server-sent events
+(function () {
+    const table = document.getElementById("transactions");
+    const source = new EventSource(table.dataset.stream);
+
+    function cell(text, rowspan) {
+        const td = document.createElement("td");
+        td.textContent = text === null || text === undefined ? "None" : text;
+        if (rowspan) {
+            td.rowSpan = rowspan;
+        }
+        return td;
+    }
+
+    source.addEventListener("balance", function (event) {
+        document.getElementById("balance").textContent = JSON.parse(event.data).balance;
+    });
+
+    source.addEventListener("transaction", function (event) {
+        const transaction = JSON.parse(event.data);
+        const first = document.createElement("tr");
+        first.append(
+            cell(transaction.id, 2),
+            cell(transaction.round),
+            cell(transaction.sender),
+            cell(transaction.amount, 2),
+            cell(transaction.note, 2)
+        );
+        const second = document.createElement("tr");
+        second.append(cell(transaction.type), cell(transaction.receiver));
+        const header = table.rows[0];
+        header.after(first, second);
+    });
+})();
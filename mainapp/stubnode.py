@@ -0,0 +1,384 @@
+"""Local HTTP server imitating the Algorand node endpoints used by the helpers.
+
+A single server answers algod, indexer and kmd requests, so it's enough to
+point ALGOD_ADDRESSES, INDEXER_ADDRESSES and KMD_ADDRESS settings to its URL.
+Submitted transactions are confirmed immediately and applied to the stub's
+balances, while accounts unknown to the stub get a synthetic transactions
+history. Every response is delayed by the configured latency.
+
+The stub is meant for benchmarks and load generation only, it doesn't verify
+signatures nor validate transactions.
+"""
+import base64
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import msgpack
+from algosdk import account, encoding, mnemonic
+
+GENESIS_HASH = base64.b64encode(bytes(32)).decode()
+STUB_TOKEN = "a" * 64
+
+
+class StubNode:
+    """Algod, indexer and kmd imitation served from a background thread."""
+
+    def __init__(
+        self, latency=0.0, transactions=10, round_time=1.0, host="127.0.0.1", port=0
+    ):
+        self.latency = latency
+        self.transactions = transactions
+        self.round_time = round_time
+        self.round = 1000
+        self.started = int(time.time())
+        self.calls = 0
+        self.balances = {}
+        self.history = {}
+        self.pending = {}
+        self.wallets = {}
+        self.asset_index = 0
+        self.holdings = {}
+        self.blocks = {}
+        self._lock = threading.Lock()
+
+        private_key, self.funder = account.generate_account()
+        self.funder_passphrase = mnemonic.from_private_key(private_key)
+        self.balances[self.funder] = 10**15
+
+        self.server = ThreadingHTTPServer((host, port), _handler_class(self))
+        self.server.daemon_threads = True
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def url(self):
+        """Return base URL of the running stub server."""
+        return "http://%s:%d" % self.server.server_address[:2]
+
+    def settings(self):
+        """Return Django settings pointing all the clients to this stub."""
+        return {
+            "ALGOD_ADDRESSES": [self.url],
+            "ALGOD_TOKEN": STUB_TOKEN,
+            "INDEXER_ADDRESSES": [self.url],
+            "INDEXER_TOKEN": STUB_TOKEN,
+            "KMD_ADDRESS": self.url,
+            "KMD_TOKEN": STUB_TOKEN,
+        }
+
+    def start(self):
+        """Start serving requests in a daemon thread."""
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop the server and release its socket."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    ## DISPATCHING
+    def handle(self, method, path, query, body):
+        """Return two-tuple of HTTP status and response for provided request."""
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        parts = [part for part in path.split("/") if part]
+        if parts and parts[0] in ("v1", "v2"):
+            parts = parts[1:]
+
+        if parts[:2] == ["status", "wait-for-block-after"]:
+            if int(parts[2]) >= self.round:
+                time.sleep(self.round_time)
+
+        with self._lock:
+            if method == "POST" and parts == ["transactions"]:
+                return self._submit(body)
+            if method == "POST" and parts and parts[0] in ("wallet", "key"):
+                return self._kmd(parts, json.loads(body or b"{}"))
+            return self._get(parts, query)
+
+    def _get(self, parts, query):
+        """Return response for provided GET request's path parts."""
+        if parts == ["health"]:
+            return 200, {"round": self.round, "db-available": True, "message": ""}
+        if parts == ["status"]:
+            return 200, self._status()
+        if parts[:2] == ["status", "wait-for-block-after"]:
+            self.round = max(self.round, int(parts[2]) + 1)
+            return 200, self._status()
+        if parts[:1] == ["blocks"] and len(parts) == 2:
+            block_round = int(parts[1])
+            if block_round > self.round:
+                return 404, {"message": "ledger does not have entry"}
+            return 200, {"block": self._block(block_round)}
+        if parts == ["transactions", "params"]:
+            return 200, {
+                "consensus-version": "future",
+                "fee": 0,
+                "genesis-hash": GENESIS_HASH,
+                "genesis-id": "stub-v1",
+                "last-round": self.round,
+                "min-fee": 1000,
+            }
+        if parts[:2] == ["transactions", "pending"] and len(parts) == 3:
+            if parts[2] not in self.pending:
+                return 404, {"message": "txn does not exist"}
+            return 200, self.pending[parts[2]]
+        if parts == ["transactions"]:
+            return 200, self._search(query)
+        if parts == ["accounts"]:
+            return 200, {
+                "accounts": [
+                    self._account(address, genesis=address == self.funder)
+                    for address in self.balances
+                ],
+                "current-round": self.round,
+            }
+        if parts[:1] == ["accounts"] and len(parts) == 2:
+            return 200, self._account(parts[1])
+        if parts[:1] == ["accounts"] and parts[2:] == ["transactions"]:
+            transactions = self._history(parts[1])
+            if "min-round" in query:
+                transactions = [
+                    tr
+                    for tr in transactions
+                    if tr["confirmed-round"] >= int(query["min-round"])
+                ]
+            return 200, self._page(transactions, query)
+        if parts[:1] == ["assets"] and parts[2:] == ["balances"]:
+            return 200, self._asset_balances(int(parts[1]), query)
+        if parts == ["wallets"]:
+            return 200, {"wallets": list(self.wallets.values())}
+        return 404, {"message": "stub node doesn't support this endpoint"}
+
+    ## ALGOD
+    def _status(self):
+        """Return node status having the stub's current round."""
+        return {
+            "catchup-time": 0,
+            "last-round": self.round,
+            "time-since-last-round": 0,
+        }
+
+    def _block(self, block_round):
+        """Return block of provided round with synthetic payment transactions."""
+        if block_round not in self.blocks:
+            sender = encoding.decode_address(self.funder)
+            self.blocks[block_round] = {
+                "rnd": block_round,
+                "ts": self.started - (self.round - block_round),
+                "txns": [
+                    {
+                        "sig": uuid.uuid4().bytes * 4,
+                        "txn": {
+                            "amt": 1000 + index,
+                            "fee": 1000,
+                            "fv": block_round - 1,
+                            "lv": block_round + 999,
+                            "note": b"Synthetic payment",
+                            "rcv": uuid.uuid4().bytes * 2,
+                            "snd": sender,
+                            "type": "pay",
+                        },
+                    }
+                    for index in range(self.transactions)
+                ],
+            }
+        return self.blocks[block_round]
+
+    def _account(self, address, genesis=False):
+        """Return account information for provided address."""
+        return {
+            "address": address,
+            "amount": self.balances.get(address, 0),
+            "assets": [],
+            "created-at-round": 0 if genesis else self.round,
+            "round": self.round,
+            "status": "Offline",
+        }
+
+    def _submit(self, body):
+        """Confirm and apply all the signed transactions from provided body."""
+        unpacker = msgpack.Unpacker(raw=False)
+        unpacker.feed(body)
+        self.round += 1
+        transaction_ids = []
+        for signed in unpacker:
+            txn = encoding.future_msgpack_decode(signed).transaction
+            transaction_id = txn.get_txid()
+            transaction_ids.append(transaction_id)
+            pending = {"confirmed-round": self.round, "pool-error": "", "txn": {}}
+            row = {
+                "id": transaction_id,
+                "confirmed-round": self.round,
+                "round-time": int(time.time()),
+                "tx-type": txn.type,
+                "sender": txn.sender,
+                "fee": txn.fee,
+                "note": base64.b64encode(txn.note or b"").decode(),
+            }
+            self.balances[txn.sender] = self.balances.get(txn.sender, 0) - txn.fee
+            if txn.type == "pay":
+                self.balances[txn.sender] -= txn.amt
+                self.balances[txn.receiver] = (
+                    self.balances.get(txn.receiver, 0) + txn.amt
+                )
+                row["payment-transaction"] = {
+                    "receiver": txn.receiver,
+                    "amount": txn.amt,
+                }
+                self._history(txn.receiver).insert(0, row)
+            elif txn.type == "acfg":
+                self.asset_index += 1
+                pending["asset-index"] = self.asset_index
+                self.holdings[self.asset_index] = {txn.sender: txn.total}
+            self._history(txn.sender).insert(0, row)
+            self.pending[transaction_id] = pending
+        return 200, {"txId": transaction_ids[0]}
+
+    ## INDEXER
+    def _history(self, address):
+        """Return transactions history of provided address.
+
+        Addresses unknown to the stub get a synthetic history.
+        """
+        if address not in self.history:
+            self.history[address] = [
+                {
+                    "id": uuid.uuid4().hex.upper(),
+                    "confirmed-round": self.round - index,
+                    "round-time": int(time.time()) - index,
+                    "tx-type": "pay",
+                    "sender": self.funder,
+                    "fee": 1000,
+                    "payment-transaction": {"receiver": address, "amount": 1000},
+                    "note": base64.b64encode(b"Synthetic payment").decode(),
+                }
+                for index in range(self.transactions)
+            ]
+        return self.history[address]
+
+    def _asset_balances(self, asset_id, query):
+        """Return page of provided asset's holders based on `limit` and `next`."""
+        offset = int(query.get("next", 0))
+        limit = int(query.get("limit", 1000))
+        holders = list(self.holdings.get(asset_id, {}).items())
+        page = {
+            "current-round": self.round,
+            "balances": [
+                {"address": address, "amount": amount, "is-frozen": False}
+                for address, amount in holders[offset : offset + limit]
+            ],
+        }
+        if offset + limit < len(holders):
+            page["next-token"] = str(offset + limit)
+        return page
+
+    def _page(self, transactions, query):
+        """Return transactions page based on `limit` and `next` query values."""
+        offset = int(query.get("next", 0))
+        limit = int(query.get("limit", 1000))
+        page = {
+            "current-round": self.round,
+            "transactions": transactions[offset : offset + limit],
+        }
+        if offset + limit < len(transactions):
+            page["next-token"] = str(offset + limit)
+        return page
+
+    def _search(self, query):
+        """Return transactions page filtered by provided query."""
+        if "address" in query:
+            transactions = self._history(query["address"])
+        else:
+            seen = set()
+            transactions = []
+            for rows in self.history.values():
+                for row in rows:
+                    if row["id"] not in seen:
+                        seen.add(row["id"])
+                        transactions.append(row)
+        if "txid" in query:
+            transactions = [tr for tr in transactions if tr["id"] == query["txid"]]
+        if "tx-type" in query:
+            transactions = [
+                tr for tr in transactions if tr["tx-type"] == query["tx-type"]
+            ]
+        return self._page(transactions, query)
+
+    ## KMD
+    def _kmd(self, parts, data):
+        """Return response for provided kmd request."""
+        if parts == ["wallet"]:
+            wallet = {"id": uuid.uuid4().hex, "name": data.get("wallet_name")}
+            self.wallets[wallet["id"]] = wallet
+            return 200, {"wallet": wallet}
+        if parts == ["wallet", "init"]:
+            return 200, {"wallet_handle_token": data.get("wallet_id")}
+        if parts == ["wallet", "renew"]:
+            wallet = self.wallets.get(data.get("wallet_handle_token"), {})
+            return 200, {"wallet_handle": {"wallet": wallet, "expires_seconds": 60}}
+        if parts == ["key"]:
+            _, address = account.generate_account()
+            return 200, {"address": address}
+        return 404, {"message": "stub node doesn't support this endpoint"}
+
+
+def _jsonable(value):
+    """Return provided response value with binary values base64 encoded."""
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode()
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def _handler_class(node):
+    """Return request handler class serving provided stub node."""
+
+    class StubNodeHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, method):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            try:
+                status, payload = node.handle(method, url.path, query, body)
+            except Exception as err:
+                status, payload = 400, {"message": str(err)}
+            if query.get("format") == "msgpack":
+                content_type = "application/msgpack"
+                content = msgpack.packb(payload, use_bin_type=True)
+            else:
+                content_type = "application/json"
+                content = json.dumps(_jsonable(payload)).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def do_GET(self):
+            self._respond("GET")
+
+        def do_POST(self):
+            self._respond("POST")
+
+        def log_message(self, format, *args):
+            """Don't log the requests."""
+
+    return StubNodeHandler
@@ -1,3 +1,972 @@
-from django.test import TestCase
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from algosdk import encoding, mnemonic
+from algosdk.error import WrongChecksumError
+from algosdk.future.transaction import PaymentTxn
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.http import Http404, HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+
+from . import fragments, metrics, resilience, signing
+from .events import RoundWatcher
+from .middleware import BackendTimingMiddleware
+from .nodes import NodePool
+from .models import Account, Asset, Wallet, WalletAccount
+from .pagination import _decode_cursor, _encode_cursor, keyset_page
+from .refresh import freshness_context, refresh_accounts
+from .resilience import BackendUnavailable, CircuitBreaker
+from .stubnode import StubNode
+
+ADDRESS = "A" * 58
+
+
+def create_asset(**kwargs):
+    """Create and return asset with provided fields overriding the defaults."""
+    fields = {
+        "asset_id": 1,
+        "creator": ADDRESS,
+        "name": "Asset",
+        "unit": "AST",
+        "total": 1000,
+        "decimals": 2,
+        **kwargs,
+    }
+    return Asset.objects.create(**fields)
+
+
+class ModelsTest(TestCase):
+    """Models' lookups and their representation on the configured database."""
+
+    def test_account_instance_from_address(self):
+        account = Account.objects.create(address=ADDRESS, private_key="key")
+        self.assertEqual(Account.instance_from_address(ADDRESS), account)
+        self.assertEqual(str(account), ADDRESS)
+
+    def test_account_instance_from_unknown_address(self):
+        with self.assertRaises(Http404):
+            Account.instance_from_address(ADDRESS)
+
+    def test_account_stored_balance_defaults(self):
+        account = Account.objects.create(address=ADDRESS, private_key="key")
+        account.refresh_from_db()
+        self.assertIsNone(account.balance)
+        self.assertIsNone(account.last_round)
+        self.assertIsNone(account.last_activity)
+        self.assertIsNone(account.refreshed)
+
+    def test_account_balance_beyond_32_bits(self):
+        balance = 10**16
+        account = Account.objects.create(
+            address=ADDRESS, private_key="key", balance=balance, last_round=2**40
+        )
+        account.refresh_from_db()
+        self.assertEqual(account.balance, balance)
+        self.assertEqual(account.last_round, 2**40)
+
+    def test_wallet_instance_from_id(self):
+        wallet = Wallet.objects.create(wallet_id="1" * 32, name="Wallet", password="")
+        self.assertEqual(Wallet.instance_from_id("1" * 32), wallet)
+        self.assertEqual(str(wallet), "Wallet")
+        with self.assertRaises(Http404):
+            Wallet.instance_from_id("2" * 32)
+
+    def test_wallet_account_is_account(self):
+        wallet = Wallet.objects.create(wallet_id="1" * 32, name="Wallet", password="")
+        account = WalletAccount.objects.create(
+            address=ADDRESS, private_key="key", wallet=wallet
+        )
+        self.assertEqual(Account.objects.get().pk, account.pk)
+        self.assertEqual(Account.objects.get().walletaccount.wallet, wallet)
+        wallet.delete()
+        self.assertFalse(Account.objects.exists())
+
+    def test_asset_representation(self):
+        asset = create_asset(name="Gold")
+        self.assertEqual(str(asset), "Gold")
+        self.assertFalse(asset.frozen)
+
+
+class MigrationsTest(TransactionTestCase):
+    """Migrations applied on the configured database match the models."""
+
+    def test_no_missing_migrations(self):
+        out = StringIO()
+        try:
+            call_command(
+                "makemigrations", "mainapp", check=True, dry_run=True, stdout=out
+            )
+        except SystemExit:
+            self.fail("Missing migrations:\n%s" % (out.getvalue(),))
+
+    def test_indexes_exist(self):
+        with connection.cursor() as cursor:
+            indexes = {
+                table: connection.introspection.get_constraints(cursor, table)
+                for table in ("mainapp_account", "mainapp_asset", "mainapp_wallet")
+            }
+        self.assertIn("account_created_id_idx", indexes["mainapp_account"])
+        self.assertIn("account_balance_idx", indexes["mainapp_account"])
+        self.assertIn("asset_created_id_idx", indexes["mainapp_asset"])
+        self.assertIn("wallet_name_id_idx", indexes["mainapp_wallet"])
+        for table, column in (
+            ("mainapp_account", "address"),
+            ("mainapp_asset", "asset_id"),
+            ("mainapp_asset", "creator"),
+            ("mainapp_wallet", "wallet_id"),
+        ):
+            self.assertTrue(
+                any(
+                    constraint["index"] and constraint["columns"] == [column]
+                    for constraint in indexes[table].values()
+                ),
+                "%s.%s isn't indexed" % (table, column),
+            )
+
+    def test_stored_balance_migration_keeps_existing_accounts(self):
+        executor = MigrationExecutor(connection)
+        before = [("mainapp", "0002_keyset_indexes")]
+        after = [("mainapp", "0003_account_stored_balance")]
+        executor.migrate(before)
+        old_account = executor.loader.project_state(before).apps.get_model(
+            "mainapp", "Account"
+        )
+        old_account.objects.create(address=ADDRESS, private_key="key")
+
+        executor.loader.build_graph()
+        executor.migrate(after)
+        new_account = executor.loader.project_state(after).apps.get_model(
+            "mainapp", "Account"
+        )
+        account = new_account.objects.get(address=ADDRESS)
+        self.assertIsNone(account.balance)
+        self.assertIsNone(account.refreshed)
+
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes("mainapp"))
+
+
+class KeysetPaginationTest(TestCase):
+    """Keyset pages walked forward and backward by their cursors."""
+
+    ordering = ("name", "id")
+
+    @classmethod
+    def setUpTestData(cls):
+        Wallet.objects.bulk_create(
+            Wallet(wallet_id=str(index), name="wallet%s" % (index // 2,), password="")
+            for index in range(7)
+        )
+        cls.wallets = list(Wallet.objects.order_by(*cls.ordering))
+
+    def page(self, **params):
+        return keyset_page(Wallet.objects.all(), self.ordering, params, per_page=3)
+
+    def test_cursor_round_trip(self):
+        wallet = self.wallets[3]
+        cursor = _encode_cursor(wallet, self.ordering)
+        self.assertEqual(
+            _decode_cursor(cursor, Wallet.objects.all(), self.ordering),
+            [wallet.name, wallet.id],
+        )
+
+    def test_datetime_cursor_round_trip(self):
+        asset = create_asset()
+        ordering = ("-created", "-id")
+        cursor = _encode_cursor(asset, ordering)
+        self.assertEqual(
+            _decode_cursor(cursor, Asset.objects.all(), ordering),
+            [asset.created, asset.id],
+        )
+
+    def test_first_page(self):
+        page = self.page()
+        self.assertEqual(list(page), self.wallets[:3])
+        self.assertFalse(page.has_previous)
+        self.assertEqual(page.previous_cursor, "")
+        self.assertTrue(page.has_next)
+
+    def test_walk_forward_and_back(self):
+        pages = [self.page()]
+        while pages[-1].has_next:
+            pages.append(self.page(after=pages[-1].next_cursor))
+        self.assertEqual([wallet for page in pages for wallet in page], self.wallets)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(pages[-1].next_cursor, "")
+
+        backward = [pages[-1]]
+        while backward[-1].has_previous:
+            backward.append(self.page(before=backward[-1].previous_cursor))
+        self.assertEqual(
+            [list(page) for page in backward[1:]],
+            [list(page) for page in pages[-2::-1]],
+        )
+
+    def test_ties_on_leading_field(self):
+        # wallets 2 and 3 share the name, so the cursor is split between them
+        page = self.page(after=_encode_cursor(self.wallets[2], self.ordering))
+        self.assertEqual(list(page), self.wallets[3:6])
+        page = self.page(before=_encode_cursor(self.wallets[3], self.ordering))
+        self.assertEqual(list(page), self.wallets[:3])
+        self.assertFalse(page.has_previous)
+
+    def test_after_last_row(self):
+        page = self.page(after=_encode_cursor(self.wallets[-1], self.ordering))
+        self.assertEqual(list(page), [])
+        self.assertFalse(page.has_previous)
+        self.assertFalse(page.has_next)
+
+    def test_before_first_row(self):
+        page = self.page(before=_encode_cursor(self.wallets[0], self.ordering))
+        self.assertEqual(list(page), [])
+        self.assertFalse(page.has_previous)
+        self.assertFalse(page.has_next)
+
+    def test_invalid_cursors(self):
+        for cursor in (
+            "not base64!",
+            "bm90IGpzb24=",  # "not json"
+            _encode_cursor(self.wallets[0], ("name",)),
+            "WyJ3YWxsZXQwIiwgIngiXQ==",  # ["wallet0", "x"]
+        ):
+            with self.subTest(cursor=cursor), self.assertRaises(Http404):
+                self.page(after=cursor)
+            with self.subTest(cursor=cursor), self.assertRaises(Http404):
+                self.page(before=cursor)
+
+
+class FlakyFunction:
+    """Callable failing with provided errors before returning its result."""
+
+    def __init__(self, *errors, result="ok", delays=()):
+        self.errors = list(errors)
+        self.delays = list(delays)
+        self.result = result
+        self.calls = 0
+        self.threads = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            self.threads.append(threading.current_thread())
+            error = self.errors.pop(0) if self.errors else None
+            delay = self.delays.pop(0) if self.delays else 0
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return self.result
+
+
+def http_error(error_class, code):
+    """Return provided SDK HTTP error with provided status code."""
+    error = error_class("error")
+    error.code = code
+    return error
+
+
+@override_settings(
+    BACKEND_TIMEOUTS={"algod": 1, "algod.status_after_block": 1, "indexer": 1},
+    BACKEND_HEDGE_DELAYS={},
+    BACKEND_RETRIES=2,
+    BACKEND_RETRY_BACKOFF=0,
+    BACKEND_POOL_SIZE=2,
+    CIRCUIT_BREAKER_THRESHOLD=3,
+    CIRCUIT_BREAKER_COOLDOWN=60,
+)
+class ResilienceTest(SimpleTestCase):
+    """Retries, hedging and circuit breaking of the backend calls."""
+
+    def setUp(self):
+        resilience._breakers.clear()
+        resilience._executors.clear()
+
+    def test_transient_errors_are_retried(self):
+        function = FlakyFunction(ConnectionResetError(), TimeoutError())
+        self.assertEqual(resilience.call("algod", "status", function), "ok")
+        self.assertEqual(function.calls, 3)
+        self.assertEqual(resilience.breaker("algod").failures, 0)
+
+    def test_retries_exhausted(self):
+        function = FlakyFunction(*[ConnectionResetError()] * 3)
+        with self.assertRaises(BackendUnavailable):
+            resilience.call("algod", "status", function)
+        self.assertEqual(function.calls, 3)
+        self.assertEqual(resilience.breaker("algod").failures, 1)
+
+    def test_non_idempotent_call_is_not_retried(self):
+        function = FlakyFunction(ConnectionResetError())
+        with self.assertRaises(BackendUnavailable):
+            resilience.call("algod", "send_transaction", function)
+        self.assertEqual(function.calls, 1)
+
+    def test_client_errors_are_not_retried(self):
+        from algosdk.error import AlgodHTTPError, IndexerHTTPError, KMDHTTPError
+
+        for error_class in (AlgodHTTPError, IndexerHTTPError, KMDHTTPError):
+            function = FlakyFunction(http_error(error_class, 404))
+            with self.subTest(error_class=error_class), self.assertRaises(error_class):
+                resilience.call("indexer", "accounts", function)
+            self.assertEqual(function.calls, 1)
+        self.assertEqual(resilience.breaker("indexer").failures, 0)
+
+    def test_server_errors_of_all_backends_are_retried(self):
+        from algosdk.error import AlgodHTTPError, IndexerHTTPError, KMDHTTPError
+
+        for error_class in (AlgodHTTPError, IndexerHTTPError, KMDHTTPError):
+            function = FlakyFunction(*[http_error(error_class, 500)] * 3)
+            with self.subTest(error_class=error_class):
+                with self.assertRaises(BackendUnavailable):
+                    resilience.call("indexer", "accounts", function)
+                self.assertEqual(function.calls, 3)
+
+    def test_timeout(self):
+        function = FlakyFunction(delays=[1.5, 1.5, 1.5])
+        with override_settings(BACKEND_TIMEOUTS={"algod": 0.1}, BACKEND_RETRIES=0):
+            with self.assertRaises(BackendUnavailable):
+                resilience.call("algod", "status", function)
+
+    def test_hedged_read(self):
+        function = FlakyFunction(delays=[0.5], result="hedged")
+        with override_settings(BACKEND_HEDGE_DELAYS={"indexer": 0.05}):
+            start = time.monotonic()
+            self.assertEqual(resilience.call("indexer", "accounts", function), "hedged")
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(function.calls, 2)
+
+    def test_fast_read_is_not_hedged(self):
+        function = FlakyFunction()
+        with override_settings(BACKEND_HEDGE_DELAYS={"indexer": 0.5}):
+            resilience.call("indexer", "accounts", function)
+        self.assertEqual(function.calls, 1)
+
+    def test_stalled_backend_does_not_block_others(self):
+        release = threading.Event()
+        stalled = [
+            resilience._pool("indexer").submit(release.wait)
+            for _ in range(settings.BACKEND_POOL_SIZE)
+        ]
+        try:
+            function = FlakyFunction()
+            self.assertEqual(resilience.call("algod", "status", function), "ok")
+            self.assertEqual(function.calls, 1)
+        finally:
+            release.set()
+        for future in stalled:
+            future.result()
+
+    def test_long_polling_call_runs_in_calling_thread(self):
+        function = FlakyFunction()
+        resilience.call("algod", "status_after_block", function)
+        self.assertEqual(function.threads, [threading.current_thread()])
+
+    def test_socket_timeout_of_the_call(self):
+        timeouts = []
+
+        def function():
+            timeouts.append(resilience.socket_timeout("algod"))
+
+        with override_settings(
+            BACKEND_TIMEOUTS={"algod": 3, "algod.status_after_block": 7}
+        ):
+            resilience.call("algod", "status", function)
+            resilience.call("algod", "status_after_block", function)
+            self.assertEqual(resilience.socket_timeout("algod"), 3)
+        self.assertEqual(timeouts, [3, 7])
+
+    def test_breaker_opens_and_rejects_calls(self):
+        for _ in range(3):
+            with self.assertRaises(BackendUnavailable):
+                resilience.call(
+                    "algod", "send_transaction", FlakyFunction(ConnectionResetError())
+                )
+        self.assertTrue(resilience.breaker("algod").is_open)
+        function = FlakyFunction()
+        with self.assertRaisesMessage(BackendUnavailable, "circuit breaker is open"):
+            resilience.call("algod", "status", function)
+        self.assertEqual(function.calls, 0)
+
+    def test_breakers_are_separate_per_circuit(self):
+        for _ in range(3):
+            with self.assertRaises(BackendUnavailable):
+                resilience.call(
+                    "algod",
+                    "send_transaction",
+                    FlakyFunction(ConnectionResetError()),
+                    circuit="node1",
+                )
+        self.assertEqual(
+            resilience.call("algod", "status", FlakyFunction(), circuit="node2"), "ok"
+        )
+
+
+class CircuitBreakerTest(SimpleTestCase):
+    """Circuit breaker's transitions between closed, open and half-open state."""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(threshold=2, cooldown=60)
+        breaker.failure()
+        self.assertFalse(breaker.is_open)
+        breaker.success()
+        breaker.failure()
+        self.assertFalse(breaker.is_open)
+        breaker.failure()
+        self.assertTrue(breaker.is_open)
+        self.assertFalse(breaker.allow())
+
+    def test_half_open_trial_success_closes(self):
+        breaker = CircuitBreaker(threshold=1, cooldown=0)
+        breaker.failure()
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # a single trial at once
+        breaker.success()
+        self.assertFalse(breaker.is_open)
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.allow())
+
+    def test_half_open_trial_failure_reopens(self):
+        breaker = CircuitBreaker(threshold=3, cooldown=0.05)
+        for _ in range(3):
+            breaker.failure()
+        self.assertFalse(breaker.allow())
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.failure()
+        self.assertTrue(breaker.is_open)
+        self.assertFalse(breaker.allow())
+
+
+class _ErrorHandler(BaseHTTPRequestHandler):
+    """Request handler answering every request with server error."""
+
+    def do_GET(self):
+        body = b'{"message": "unavailable"}'
+        self.send_response(503)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@override_settings(
+    BACKEND_TIMEOUTS={"algod": 0.2, "indexer": 0.2, "kmd": 0.2},
+    BACKEND_HEDGE_DELAYS={},
+    BACKEND_RETRIES=2,
+    BACKEND_RETRY_BACKOFF=0,
+    CIRCUIT_BREAKER_THRESHOLD=5,
+    CIRCUIT_BREAKER_COOLDOWN=60,
+)
+class SDKClientsTest(SimpleTestCase):
+    """Socket timeouts and HTTP statuses of the SDK clients' requests."""
+
+    def setUp(self):
+        resilience._breakers.clear()
+
+    def test_stalled_node_times_out(self):
+        from .sdkclients import IndexerClient
+
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen()
+            client = IndexerClient(
+                "token", "http://127.0.0.1:%d" % (server.getsockname()[1],)
+            )
+            start = time.monotonic()
+            with self.assertRaises(OSError):
+                client.health()
+            self.assertLess(time.monotonic() - start, 1)
+
+    def test_server_errors_carry_status(self):
+        from algosdk.error import IndexerHTTPError
+
+        from .sdkclients import AlgodClient, IndexerClient, KMDClient
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _ErrorHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        address = "http://127.0.0.1:%d" % (server.server_address[1],)
+        try:
+            for client, method in (
+                (AlgodClient("token", address), "status"),
+                (IndexerClient("token", address), "health"),
+                (KMDClient("token", address), "versions"),
+            ):
+                with self.subTest(client=client):
+                    with self.assertRaises(Exception) as context:
+                        getattr(client, method)()
+                    self.assertEqual(context.exception.code, 503)
+                    self.assertEqual(str(context.exception), "unavailable")
+
+            client = IndexerClient("token", address)
+            for _ in range(3):
+                with self.assertRaises(BackendUnavailable) as context:
+                    resilience.call("indexer", "health", client.health)
+                self.assertIsInstance(context.exception.__cause__, IndexerHTTPError)
+            self.assertEqual(resilience.breaker("indexer").failures, 3)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+@override_settings(
+    BACKEND_TIMEOUTS={"algod": 1},
+    BACKEND_HEDGE_DELAYS={"algod": 0.05},
+    BACKEND_RETRIES=0,
+    BACKEND_POOL_SIZE=4,
+    CIRCUIT_BREAKER_THRESHOLD=1,
+    CIRCUIT_BREAKER_COOLDOWN=60,
+    HEALTH_CHECK_INTERVAL=60,
+    NODE_MAX_LAG=2,
+)
+class NodePoolTest(SimpleTestCase):
+    """Routing of the calls among the nodes of a pool."""
+
+    def setUp(self):
+        resilience._breakers.clear()
+        resilience._executors.clear()
+        self.pool = NodePool("algod", ["http://node%d" % (i,) for i in range(3)], "")
+        self.pool.checked_at = time.monotonic()
+        for node, round_number in zip(self.pool.nodes, (100, 99, 97)):
+            node.round = round_number
+
+    def readers(self, **kwargs):
+        return {self.pool.reader(**kwargs) for _ in range(50)}
+
+    def test_reader_skips_lagging_nodes(self):
+        self.assertEqual(self.readers(), set(self.pool.nodes[:2]))
+
+    def test_reader_picks_the_least_loaded_node(self):
+        self.pool.nodes[0].in_flight = 2
+        self.pool.nodes[1].in_flight = 1
+        self.assertEqual(self.readers(), {self.pool.nodes[1]})
+
+    def test_reader_excludes_provided_node(self):
+        self.pool.nodes[1].in_flight = 1
+        self.assertEqual(self.readers(exclude=self.pool.nodes[0]), {self.pool.nodes[1]})
+        self.pool.nodes[1].healthy = False
+        self.assertEqual(self.readers(exclude=self.pool.nodes[0]), {self.pool.nodes[0]})
+
+    def test_unavailable_nodes_are_skipped(self):
+        self.pool.nodes[0].healthy = False
+        resilience.breaker(self.pool.nodes[1].address).failure()
+        self.assertEqual(self.pool.primary(), self.pool.nodes[2])
+        self.assertEqual(self.readers(), {self.pool.nodes[2]})
+
+    def test_primary_fails_over_to_the_next_node(self):
+        self.assertEqual(self.pool.primary(), self.pool.nodes[0])
+        self.pool.nodes[0].healthy = False
+        self.assertEqual(self.pool.primary(), self.pool.nodes[1])
+        for node in self.pool.nodes:
+            node.healthy = False
+        self.assertEqual(self.pool.primary(), self.pool.nodes[0])
+        self.assertEqual(self.pool.reader(), self.pool.nodes[0])
+
+    def test_hedged_read_goes_to_another_node(self):
+        from .helpers.clients import InstrumentedClient
+
+        def status(node, delay):
+            def function():
+                time.sleep(delay)
+                return node.address
+
+            return function
+
+        first, second, _ = self.pool.nodes
+        first._client = mock.Mock(status=status(first, 0.5))
+        second._client = mock.Mock(status=status(second, 0))
+        second.in_flight = 1
+        self.assertEqual(InstrumentedClient(self.pool).status(), second.address)
+
+
+class RoundWatcherTest(SimpleTestCase):
+    """New rounds awaited once for all the subscribed streams."""
+
+    def test_single_long_poll_wakes_all_streams(self):
+        calls = []
+
+        def wait_for_round(round_number):
+            calls.append(round_number)
+            time.sleep(0.05)
+            return round_number + 1
+
+        watcher = RoundWatcher()
+        rounds = []
+        with mock.patch("mainapp.helpers.current_round", return_value=10):
+            with mock.patch("mainapp.helpers.wait_for_round", wait_for_round):
+
+                def stream():
+                    with watcher.subscription():
+                        rounds.append(watcher.wait(10, 5))
+
+                threads = [threading.Thread(target=stream) for _ in range(20)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+        self.assertEqual(rounds, [11] * 20)
+        self.assertLessEqual(len(calls), 2)
+        time.sleep(0.2)
+        self.assertFalse(watcher._running)
+
+    def test_wait_times_out_with_the_known_round(self):
+        watcher = RoundWatcher()
+        watcher.round = 10
+        self.assertEqual(watcher.wait(10, 0.01), 10)
+
+    def test_unavailable_algod_ends_the_streams(self):
+        error = BackendUnavailable("algod", "down")
+        watcher = RoundWatcher()
+        with mock.patch("mainapp.helpers.current_round", side_effect=error):
+            with override_settings(ACCOUNT_EVENTS_RETRY=10):
+                with watcher.subscription(), self.assertRaises(BackendUnavailable):
+                    watcher.wait(10, 5)
+
+    def test_unexpected_error_ends_the_streams(self):
+        from algosdk.error import AlgodHTTPError
+
+        watcher = RoundWatcher()
+        with mock.patch(
+            "mainapp.helpers.current_round", side_effect=[KeyError("last-round"), 10]
+        ), mock.patch(
+            "mainapp.helpers.wait_for_round",
+            side_effect=http_error(AlgodHTTPError, 401),
+        ) as wait_for_round, override_settings(
+            ACCOUNT_EVENTS_RETRY=10
+        ):
+            with watcher.subscription():
+                with self.assertRaises(BackendUnavailable):
+                    watcher.wait(10, 5)
+                time.sleep(0.1)
+            time.sleep(0.1)
+        self.assertTrue(wait_for_round.called)
+        self.assertFalse(watcher._running)
+
+
+class RefreshAccountsTest(TestCase):
+    """Refreshing of the stored balances and invalidation of the cached lists."""
+
+    def setUp(self):
+        self.wallet = Wallet.objects.create(wallet_id="1", name="Wallet", password="")
+        self.standalone = Account.objects.create(address="A" * 58)
+        self.wallet_account = WalletAccount.objects.create(
+            address="B" * 58, wallet=self.wallet
+        )
+        self.states = {"A" * 58: (100, 10), "B" * 58: (200, 11)}
+
+    def refresh(self):
+        with mock.patch(
+            "mainapp.helpers.account_states", lambda addresses: self.states
+        ), mock.patch(
+            "mainapp.helpers.account_last_activities",
+            lambda addresses: {address: None for address in addresses},
+        ):
+            return refresh_accounts()
+
+    def versions(self):
+        return (
+            fragments.list_version("accounts"),
+            fragments.list_version("wallet_accounts:%s" % (self.wallet.pk,)),
+        )
+
+    def test_refresh_stores_balances_and_rounds(self):
+        self.assertEqual(self.refresh(), (2, 2))
+        self.assertEqual(
+            list(Account.objects.order_by("id").values_list("balance", "last_round")),
+            [(100, 10), (200, 11)],
+        )
+
+    def test_unchanged_rows_keep_their_own_round(self):
+        self.refresh()
+        self.states = {"A" * 58: (100, 15), "B" * 58: (200, 17)}
+        self.assertEqual(self.refresh(), (2, 0))
+        self.assertEqual(
+            list(Account.objects.order_by("id").values_list("last_round", flat=True)),
+            [15, 17],
+        )
+
+    def test_only_changed_rows_are_rewritten(self):
+        self.refresh()
+        self.states = {"A" * 58: (150, 15), "B" * 58: (200, 15)}
+        with mock.patch.object(
+            Account.objects, "bulk_update", wraps=Account.objects.bulk_update
+        ) as bulk_update, self.assertNumQueries(5):
+            self.assertEqual(self.refresh(), (2, 1))
+        self.assertEqual(
+            [account.address for account in bulk_update.call_args[0][0]], ["A" * 58]
+        )
+        self.assertEqual(
+            list(Account.objects.order_by("id").values_list("balance", "last_round")),
+            [(150, 15), (200, 15)],
+        )
+
+    def test_lists_are_invalidated_only_on_change(self):
+        self.refresh()
+        versions = self.versions()
+        self.states = {"A" * 58: (100, 15), "B" * 58: (200, 17)}
+        self.refresh()
+        self.assertEqual(self.versions(), versions)
+
+        self.states = {"A" * 58: (100, 20), "B" * 58: (250, 20)}
+        self.refresh()
+        self.assertEqual(self.versions(), (versions[0], versions[1] + 1))
+
+        self.states = {"A" * 58: (150, 21), "B" * 58: (250, 21)}
+        self.refresh()
+        self.assertEqual(self.versions(), (versions[0] + 1, versions[1] + 1))
+
+    def test_freshness_context(self):
+        self.assertEqual(freshness_context(Account.objects.all()), {})
+        self.refresh()
+        context = freshness_context(Account.objects.all())
+        self.assertEqual(context["balances_round"], 10)
+        self.assertIsNotNone(context["balances_refreshed"])
+
+
+class MetricsTest(SimpleTestCase):
+    """Recording and reporting of the backend calls."""
+
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_render(self):
+        metrics.record("algod", "status", 0.02)
+        metrics.record("algod", "status", 3.0, error=True)
+        metrics.record_request("index", [("algod", "status", 0.02)])
+        text = metrics.render()
+        self.assertIn(
+            'algodjango_backend_call_seconds_bucket{backend="algod",'
+            'endpoint="status",le="0.025"} 1',
+            text,
+        )
+        self.assertIn(
+            'algodjango_backend_call_seconds_count{backend="algod",endpoint="status"} 2',
+            text,
+        )
+        self.assertIn(
+            'algodjango_backend_call_errors_total{backend="algod",endpoint="status"} 1',
+            text,
+        )
+        self.assertIn(
+            'algodjango_backend_calls_per_request_bucket{view="index",le="1"} 1', text
+        )
+
+    def test_server_timing(self):
+        calls = [
+            ("indexer", "accounts", 0.0125),
+            ("algod", "status", 0.001),
+            ("algod", "account_info", 0.002),
+        ]
+        self.assertEqual(
+            metrics.server_timing(calls),
+            'algod;dur=3.0;desc="2 calls", indexer;dur=12.5;desc="1 calls"',
+        )
+
+    def test_timed_records_errors(self):
+        with self.assertRaises(ValueError), metrics.timed("kmd", "list_wallets"):
+            raise ValueError
+        self.assertIn(
+            'algodjango_backend_call_errors_total{backend="kmd",'
+            'endpoint="list_wallets"} 1',
+            metrics.render(),
+        )
+
+    def test_middleware_reports_calls_of_the_request(self):
+        def view(request):
+            metrics.record("algod", "status", 0.004)
+            return HttpResponse()
+
+        request = RequestFactory().get("/")
+        request.resolver_match = None
+        response = BackendTimingMiddleware(view)(request)
+        self.assertEqual(response["Server-Timing"], 'algod;dur=4.0;desc="1 calls"')
+        self.assertIn('view="",le="1"} 1', metrics.render())
+
+    def test_middleware_without_calls(self):
+        request = RequestFactory().get("/")
+        request.resolver_match = None
+        response = BackendTimingMiddleware(lambda request: HttpResponse())(request)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_unnamed_url_pattern(self):
+        self.client.get("/admin/nonexistent/thing/")
+        response = self.client.get("/metrics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("catch_all_view", response.content.decode())
+
+
+class SignBatchTest(SimpleTestCase):
+    """Grouping and signing of the transaction batches."""
+
+    def setUp(self):
+        from algosdk import account
+        from algosdk.future.transaction import SuggestedParams
+
+        params = SuggestedParams(1000, 1, 1000, "A" * 44, flat_fee=True)
+        self.keys = [account.generate_account() for _ in range(3)]
+        self.items = [
+            (
+                PaymentTxn(
+                    self.keys[index % 3][1],
+                    params,
+                    self.keys[0][1],
+                    index,
+                    None,
+                    b"%d" % index,
+                ),
+                mnemonic.from_private_key(self.keys[index % 3][0]),
+            )
+            for index in range(20)
+        ]
+
+    def assertSigned(self, groups):
+        self.assertEqual([len(group) for group in groups], [16, 4])
+        signed = [stxn for group in groups for stxn in group]
+        for stxn, (txn, reference) in zip(signed, self.items):
+            self.assertEqual(stxn.transaction.note, txn.note)
+            self.assertEqual(
+                encoding.msgpack_encode(stxn),
+                encoding.msgpack_encode(txn.sign(mnemonic.to_private_key(reference))),
+            )
+        group_ids = [{stxn.transaction.group for stxn in group} for group in groups]
+        self.assertEqual([len(ids) for ids in group_ids], [1, 1])
+        self.assertNotEqual(group_ids[0], group_ids[1])
+
+    @override_settings(SIGNING_POOL_MIN_BATCH=64)
+    def test_small_batch_is_signed_inline(self):
+        with mock.patch("mainapp.signing._pool") as pool:
+            groups = signing.sign_batch(self.items)
+        pool.assert_not_called()
+        self.assertSigned(groups)
+
+    @override_settings(SIGNING_POOL_MIN_BATCH=1, SIGNING_WORKERS=2)
+    def test_large_batch_is_signed_by_pool(self):
+        self.addCleanup(setattr, signing, "_executor", None)
+        try:
+            groups = signing.sign_batch(self.items)
+        finally:
+            signing._executor.shutdown()
+        self.assertSigned(groups)
+
+    def test_keys_are_decoded_once(self):
+        with mock.patch(
+            "mainapp.signing.mnemonic.to_private_key",
+            side_effect=mnemonic.to_private_key,
+        ) as to_private_key:
+            signing.sign_batch(self.items)
+        self.assertEqual(to_private_key.call_count, 3)
+
+    def test_invalid_passphrase(self):
+        words = self.items[5][1].split()
+        self.items[5] = (self.items[5][0], " ".join([words[1]] + words[1:]))
+        with mock.patch("mainapp.signing._sign_chunk") as sign_chunk:
+            with self.assertRaises(WrongChecksumError):
+                signing.sign_batch(self.items)
+        sign_chunk.assert_not_called()
+
+
+@override_settings(
+    BACKEND_HEDGE_DELAYS={},
+    BACKEND_RETRIES=0,
+    HEALTH_CHECK_INTERVAL=60,
+    NODE_MAX_LAG=2,
+)
+class ApiTest(TestCase):
+    """Conditional responses and validation of the API endpoints."""
+
+    def setUp(self):
+        from algosdk import account
+
+        resilience._breakers.clear()
+        cache.clear()
+        self.node = StubNode(transactions=5).start()
+        self.lagging = StubNode().start()
+        self.addCleanup(self.node.stop)
+        self.addCleanup(self.lagging.stop)
+        self.node.round = 1002
+        self.address = account.generate_account()[1]
+        self.node.balances[self.address] = 5000
+        self.lagging.balances[self.address] = 3000
+        Account.objects.create(address=self.address)
+        settings_override = override_settings(
+            **{
+                **self.node.settings(),
+                "ALGOD_ADDRESSES": [self.node.url, self.lagging.url],
+            }
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_conditional_requests(self):
+        url = "/api/accounts/%s/" % (self.address,)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], '"round-1002"')
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304
+        )
+        self.assertEqual(
+            self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            ).status_code,
+            304,
+        )
+        self.node.round += 1
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200
+        )
+
+    def test_lagging_nodes_are_not_read(self):
+        for _ in range(10):
+            cache.clear()
+            response = self.client.get("/api/accounts/%s/" % (self.address,))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["balance"], 5000)
+            response = self.client.get("/api/balances/", {"address": self.address})
+            self.assertEqual(response.json()["balances"], {self.address: 5000})
+
+    def test_transactions_pages(self):
+        url = "/api/accounts/%s/transactions/" % (self.address,)
+        response = self.client.get(url, {"limit": 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["transactions"]), 3)
+        response = self.client.get(url, {"limit": 3, "next": response.json()["next"]})
+        self.assertEqual(len(response.json()["transactions"]), 2)
+        self.assertIsNone(response.json()["next"])
+
+    def test_invalid_transactions_query(self):
+        url = "/api/accounts/%s/transactions/" % (self.address,)
+        for query, error in (
+            ({"limit": "-1"}, "Limit must be a positive integer!"),
+            ({"next": "invalid"}, "Invalid next token!"),
+        ):
+            response = self.client.get(url, query)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {"error": error})
+
+    @override_settings(API_MAX_ADDRESSES=2)
+    def test_invalid_balances_query(self):
+        for addresses, error in (
+            ([], "At least one address is required!"),
+            ([ADDRESS, "B" * 58, "C" * 58], "At most 2 addresses are allowed!"),
+            ([self.address, "invalid"], "Invalid address: invalid"),
+        ):
+            response = self.client.get("/api/balances/", {"address": addresses})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {"error": error})
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import api, views
 
 urlpatterns = [
     path("", views.index, name="index"),
@@ -10,6 +10,11 @@ urlpatterns = [
         views.standalone_account,
         name="standalone-account",
     ),
+    path(
+        "account-stream/<str:address>/",
+        views.account_stream,
+        name="account-stream",
+    ),
     path("initial-funds/<str:receiver>/", views.initial_funds, name="initial-funds"),
     path("transfer-funds/<str:sender>/", views.transfer_funds, name="transfer-funds"),
     path("wallets/", views.wallets, name="wallets"),
@@ -27,5 +32,15 @@ urlpatterns = [
     ),
     path("assets/", views.assets, name="assets"),
     path("create-asset/", views.create_asset, name="create-asset"),
+    path("portfolio/", views.portfolio, name="portfolio"),
     path("search/", views.search, name="search"),
+    path("metrics/", views.metrics, name="metrics"),
+    path("api/accounts/<str:address>/", api.account, name="api-account"),
+    path(
+        "api/accounts/<str:address>/transactions/",
+        api.account_transactions,
+        name="api-account-transactions",
+    ),
+    path("api/assets/", api.assets, name="api-assets"),
+    path("api/balances/", api.balances, name="api-balances"),
 ]
@@ -1,31 +1,41 @@
+from django.conf import settings
 from django.contrib import messages
-from django.http import Http404
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
 
+from . import fragments, helpers, metrics as backend_metrics
+from .constants import INITIAL_FUNDS
+from .events import account_events
 from .forms import (
     CreateAssetForm,
     CreateWalletForm,
     SearchTransactionsForm,
     TransferFundsForm,
 )
-from .helpers import (
-    INITIAL_FUNDS,
-    add_asset,
-    add_standalone_account,
-    add_transaction,
-    add_wallet,
-    cli_passphrase_for_account,
-    get_wallet,
-    initial_funds_sender,
-    search_transactions,
-)
 from .models import Account, Asset, Wallet, WalletAccount
+from .pagination import keyset_page
+from .refresh import freshness_context
+
+
+def account_stream(request, address):
+    """Stream new transactions and balance of the account with provided address."""
+    account = Account.instance_from_address(address)
+    last_event_id = request.headers.get("Last-Event-ID", "")
+    response = StreamingHttpResponse(
+        account_events(
+            account.address, int(last_event_id) if last_event_id.isdigit() else None
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
 def assets(request):
     """Display all the created assets."""
-    assets = Asset.objects.order_by("-created")
-    context = {"assets": assets}
+    assets = keyset_page(Asset.objects.all(), ("-created", "-id"), request.GET)
+    context = {"assets": assets, **fragments.fragment_context("assets", assets)}
     return render(request, "mainapp/assets.html", context)
 
 
@@ -44,7 +54,7 @@ def create_asset(request):
 
             if form.is_valid():
 
-                asset_id, error_description = add_asset(form.cleaned_data)
+                asset_id, error_description = helpers.add_asset(form.cleaned_data)
                 if error_description == "":
 
                     asset = form.save(commit=False)
@@ -69,7 +79,7 @@ def create_asset(request):
 
 def create_standalone(request):
     """Create standalone account."""
-    private_key, address = add_standalone_account()
+    private_key, address = helpers.add_standalone_account()
     account = Account.objects.create(address=address, private_key=private_key)
     context = {"account": (address, account.passphrase)}
     return render(request, "mainapp/create_standalone.html", context)
@@ -83,7 +93,7 @@ def create_wallet(request):
 
         if form.is_valid():
 
-            wallet_id = add_wallet(
+            wallet_id = helpers.add_wallet(
                 form.cleaned_data["name"], form.cleaned_data["password"]
             )
             if wallet_id != "":
@@ -111,7 +121,7 @@ def create_wallet(request):
 def create_wallet_account(request, wallet_id):
     """Create account in the wallet with provided ID."""
     model = Wallet.instance_from_id(wallet_id)
-    wallet = get_wallet(model.name, model.password)
+    wallet = helpers.get_wallet(model.name, model.password)
     address = wallet.generate_key()
     WalletAccount.objects.create(wallet=model, address=address)
     message = "Address '{}' has been created in the wallet.".format(address)
@@ -122,8 +132,16 @@ def create_wallet_account(request, wallet_id):
 def index(request):
     """Display all the created standalone accounts."""
 
-    accounts = Account.objects.exclude(walletaccount__isnull=False).order_by("-created")
-    context = {"accounts": accounts}
+    accounts = keyset_page(
+        Account.objects.exclude(walletaccount__isnull=False),
+        ("-created", "-id"),
+        request.GET,
+    )
+    context = {
+        "accounts": accounts,
+        **fragments.fragment_context("accounts", accounts),
+        **freshness_context(accounts),
+    }
     return render(request, "mainapp/index.html", context)
 
 
@@ -133,21 +151,38 @@ def initial_funds(request, receiver):
     Initial funds are transferred from one of the testing accounts
     created in the sandbox.
     """
-    sender = initial_funds_sender()
+    sender = helpers.initial_funds_sender()
     if sender is None:
         message = "Initial funds weren't transferred!"
         messages.add_message(request, messages.ERROR, message)
     else:
-        add_transaction(
+        helpers.add_transaction(
             sender,
             receiver,
-            cli_passphrase_for_account(sender),
+            helpers.cli_passphrase_for_account(sender),
             INITIAL_FUNDS,
             "Initial funds",
         )
     return redirect("standalone-account", receiver)
 
 
+def metrics(request):
+    """Display backend call metrics to the requests from internal addresses."""
+    if request.META.get("REMOTE_ADDR") not in settings.INTERNAL_IPS:
+        raise Http404
+    return HttpResponse(
+        backend_metrics.render(), content_type="text/plain; version=0.0.4"
+    )
+
+
+def portfolio(request):
+    """Display totals and distributions of all the accounts' balances and assets."""
+    from .portfolio import portfolio_summary  # imports NumPy
+
+    context = {"portfolio": portfolio_summary()}
+    return render(request, "mainapp/portfolio.html", context)
+
+
 def search(request):
     """Search transactions based on criteria created from the form data."""
     transactions = []
@@ -157,7 +192,7 @@ def search(request):
 
         if form.is_valid():
 
-            transactions = search_transactions(form.cleaned_data)
+            transactions = helpers.search_transactions(form.cleaned_data)
 
     else:
         form = SearchTransactionsForm()
@@ -188,7 +223,7 @@ def transfer_funds(request, sender):
 
             if form.is_valid():
 
-                error_field, error_description = add_transaction(
+                error_field, error_description = helpers.add_transaction(
                     sender,
                     form.cleaned_data["receiver"],
                     form.cleaned_data["passphrase"],
@@ -215,7 +250,14 @@ def transfer_funds(request, sender):
 
 def wallet(request, wallet_id):
     """Display information of the wallet with provided ID."""
-    context = {"wallet": Wallet.instance_from_id(wallet_id)}
+    model = Wallet.instance_from_id(wallet_id)
+    accounts = model.walletaccount_set.all()
+    context = {
+        "wallet": model,
+        "accounts": accounts,
+        **fragments.fragment_context("wallet_accounts:%s" % (model.pk,), accounts),
+        **freshness_context(accounts),
+    }
     return render(request, "mainapp/wallet.html", context)
 
 
@@ -230,6 +272,6 @@ def wallet_account(request, wallet_id, address):
 
 def wallets(request):
     """Display all the created wallets."""
-    wallets = Wallet.objects.order_by("name")
-    context = {"wallets": wallets}
+    wallets = keyset_page(Wallet.objects.all(), ("name", "id"), request.GET)
+    context = {"wallets": wallets, **fragments.fragment_context("wallets", wallets)}
     return render(request, "mainapp/wallets.html", context)
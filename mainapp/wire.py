@@ -0,0 +1,56 @@
+"""Decoding of the algod responses requested in JSON or msgpack format.
+
+Algod encodes blocks and pending transactions the same way in both formats,
+except that binary values (addresses, notes, hashes) are base64 encoded
+strings in JSON and raw bytes in msgpack. Msgpack payloads are smaller and
+they're unpacked without the JSON parsing and base64 decoding, so with the
+ALGOD_RESPONSE_FORMAT setting set to "msgpack" the endpoints supporting it
+are requested in msgpack. Indexer and the rest of the algod endpoints,
+including the accounts, are always read in JSON.
+
+Blocks are decoded straight into the compact rows by `block_rows`, which is
+used only by the `wireformat` benchmark for now.
+"""
+import base64
+import functools
+import json
+
+import msgpack
+from algosdk import encoding
+
+
+@functools.lru_cache(maxsize=4096)
+def _address(public_key):
+    """Return address of provided public key, memoized for recurring accounts."""
+    return encoding.encode_address(public_key)
+
+
+def _bytes(value):
+    """Return raw bytes of provided binary value from either format."""
+    return base64.b64decode(value) if isinstance(value, str) else value
+
+
+def block_rows(block, round_number):
+    """Return compact rows of the transactions from provided decoded block."""
+    rows = []
+    for signed in block.get("txns") or []:
+        txn = signed.get("txn", {})
+        receiver = txn.get("rcv") or txn.get("arcv")
+        rows.append(
+            {
+                "round": round_number,
+                "type": txn.get("type"),
+                "sender": _address(_bytes(txn.get("snd"))),
+                "receiver": _address(_bytes(receiver)) if receiver else None,
+                "amount": txn.get("amt") or txn.get("aamt"),
+                "note": _bytes(txn.get("note", b"")).decode("utf-8", "replace"),
+            }
+        )
+    return rows
+
+
+def decode(payload, response_format):
+    """Return dictionary decoded from provided payload in provided format."""
+    if response_format == "msgpack":
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    return json.loads(payload)